@@ -53,11 +53,7 @@ class Container(UIElement):
         element.parent = self
         element.set_visibility(self._visible)
         self._ui_manager.update_element_theme(element, True)
-        self._ui_manager.ask_refresh()
-        if self.parent is not None:
-            self.parent.update_element()
-        else:
-            self.update_element()
+        self.ask_layout_update()
         return element
     
     def remove_element(self, element: UIElement) -> None:
@@ -70,8 +66,8 @@ class Container(UIElement):
             element.parent = None
             element.delete()
             self._elements.remove(element)
-            self.update_element()
-            self._ui_manager.ask_refresh()
+            self.ask_layout_update()
+            self._ui_manager.ask_refresh(self)
         except ValueError:
             pass
     
@@ -79,26 +75,29 @@ class Container(UIElement):
         for element in self._elements:
             element.delete()
         self._elements.clear()
-        self.update_element()
-        self._ui_manager.ask_refresh()
+        self.ask_layout_update()
+        self._ui_manager.ask_refresh(self)
+
+    def get_children(self) -> list[UIElement]:
+        return self._elements
 
     def get_content_size(self) -> tuple[int, int]:
         max_width, max_height = 0, 0
         for element in self._elements:
-            width, height = element.get_size()
+            width, height = element.get_measured_size()
             max_width = max(max_width, width)
             max_height = max(max_height, height)
         return (max_width, max_height)
 
-    def update_element(self) -> None:
-        super().update_element()
+    def arrange(self) -> None:
+        super().arrange()
         for element in self._elements:
-            element.update_element()
+            element.arrange()
     
     def _display(self) -> None:
         super()._display()
         for element in self._elements:
-            element._display()
+            element.display_clipped()
 
     def set_selected(self, selected: bool) -> None:
         for child in self._elements:
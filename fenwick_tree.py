@@ -0,0 +1,73 @@
+from itertools import accumulate
+
+class FenwickTree:
+    """
+    A list of non-negative integers who can compute the sum of its first values in O(log n),
+    and find where a given sum is reached in O(log n).
+    Changing a value is O(log n) too.
+    """
+    def __init__(self, values: list[int]|None=None) -> None:
+        self._values: list[int] = [] if values is None else list(values)
+        self._tree: list[int] = [0, *self._values] # 1-indexed, self._tree[i] is the sum of the values of (i - lowbit(i), i]
+        for index in range(1, len(self._tree)):
+            parent_index = index + (index & -index)
+            if parent_index < len(self._tree):
+                self._tree[parent_index] += self._tree[index]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __getitem__(self, index: int) -> int:
+        return self._values[index]
+
+    def get_values(self) -> list[int]:
+        return self._values
+
+    def set(self, index: int, value: int) -> None:
+        delta = value - self._values[index]
+        if delta == 0: return
+        self._values[index] = value
+        index += 1
+        while index < len(self._tree):
+            self._tree[index] += delta
+            index += index & -index
+
+    def extend(self, values: list[int]) -> None:
+        """Add values at the end, in O(len(values) + log² n)"""
+        start = len(self._values)
+        self._values.extend(values)
+        prefix_sums = list(accumulate(values, initial=self.prefix_sum(start))) # prefix_sums[i] is the sum of the 'start + i' first values
+        for index in range(start + 1, len(self._values) + 1):
+            first_index = index - (index & -index)
+            first_sum = prefix_sums[first_index - start] if first_index >= start else self.prefix_sum(first_index)
+            self._tree.append(prefix_sums[index - start] - first_sum)
+
+    def prefix_sum(self, index: int) -> int:
+        """Returns the sum of the 'index' first values"""
+        index = min(index, len(self._values))
+        total = 0
+        while index > 0:
+            total += self._tree[index]
+            index -= index & -index
+        return total
+
+    def get_total(self) -> int:
+        return self.prefix_sum(len(self._values))
+
+    def find(self, position: int) -> int:
+        """
+        Returns the biggest index whose prefix sum is smaller or equal to the given position,
+        so, if the values are sizes, the index of the value containing the position.
+        Returns 0 if the position is negative and len(self) if it is after all the values.
+        """
+        if position < 0:
+            return 0
+        index = 0
+        step = 1 << (len(self._values).bit_length())
+        while step:
+            next_index = index + step
+            if next_index < len(self._tree) and self._tree[next_index] <= position:
+                index = next_index
+                position -= self._tree[next_index]
+            step >>= 1
+        return index
@@ -0,0 +1,133 @@
+from typing import Callable
+from array import array
+from collections import OrderedDict
+from itertools import accumulate, islice
+import csv
+import mmap
+from table_data_model_interface import TableDataModelInterface
+
+class FileTableDataModel(TableDataModelInterface):
+    """
+    The rows of a CSV or fixed-width file, read from a memory-mapped file.
+    The offsets of the rows are found in chunks, one per frame (see update), so opening a file is near-instant
+    and the table gets more rows as the file is indexed. Only the offsets are stored (8 bytes per row):
+    the rows are parsed when they are displayed, and an LRU of the last parsed rows is kept.
+    If 'columns_widths' is given, the rows are split at fixed widths, else they are parsed as CSV rows with the delimiter.
+    A row is a line of the file, so CSV values can't contain line breaks.
+    """
+    _CHUNK_SIZE = 1 << 20
+
+    def __init__(
+            self,
+            path: str,
+            delimiter: str = ',',
+            columns_widths: list[int]|None = None,
+            has_header: bool = True,
+            encoding: str = 'utf-8',
+            cache_size: int = 1024) -> None:
+        self.delimiter = delimiter
+        self.columns_widths = columns_widths
+        self.encoding = encoding
+        self.cache_size = cache_size
+        self._file = open(path, 'rb')
+        self._size = self._file.seek(0, 2)
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self._size else b''
+        self._rows_cache: OrderedDict[int, list[str]] = OrderedDict()
+        self._on_change_functions: list[Callable[[], None]] = []
+        header_end = self._get_line_end(0)
+        first_row = self._parse_line(self._mmap[:header_end]) if self._size else []
+        if has_header:
+            self._columns_names = first_row
+            start = min(header_end + 1, self._size)
+        else:
+            self._columns_names = [str(index) for index in range(len(first_row))]
+            start = 0
+        self._offsets = array('q', [start]) # _offsets[i] is the start of the row i, and the end of the row i - 1 plus one
+        self._indexed_end = start
+        self._index_next_chunk()
+
+    def _get_line_end(self, start: int) -> int:
+        end = self._mmap.find(b'\n', start)
+        return self._size if end == -1 else end
+
+    def _parse_line(self, line: bytes) -> list[str]:
+        text = line.decode(self.encoding, errors='replace').removesuffix('\r')
+        if self.columns_widths is not None:
+            starts = list(accumulate(self.columns_widths, initial=0))
+            return [text[start:end].strip() for start, end in zip(starts, starts[1:])]
+        return next(csv.reader([text], delimiter=self.delimiter), [])
+
+    def is_indexed(self) -> bool:
+        return self._indexed_end >= self._size
+
+    def _index_next_chunk(self) -> None:
+        start = self._indexed_end
+        if start >= self._size: return
+        limit = start + self._CHUNK_SIZE
+        if limit >= self._size:
+            end = self._size
+        else:
+            end = self._mmap.rfind(b'\n', start, limit) + 1
+            if end == 0: # a line longer than a chunk
+                end = min(self._get_line_end(limit) + 1, self._size)
+        lines = self._mmap[start:end].split(b'\n')
+        if lines[-1] == b'': # the chunk ends with a line break
+            lines.pop()
+        self._offsets.extend(islice(accumulate((len(line) + 1 for line in lines), initial=start), 1, None))
+        self._indexed_end = end
+
+    def index_all(self) -> None:
+        """Find the offsets of all the rows now instead of one chunk per frame"""
+        if self.is_indexed(): return
+        while not self.is_indexed():
+            self._index_next_chunk()
+        self._changed()
+
+    def update(self) -> bool:
+        if self.is_indexed(): return False
+        self._index_next_chunk()
+        self._changed()
+        return not self.is_indexed()
+
+    def add_on_change_function(self, function: Callable[[], None]) -> None:
+        """The function is called each time the displayed rows change"""
+        self._on_change_functions.append(function)
+
+    def remove_on_change_function(self, function: Callable[[], None]) -> None:
+        if function in self._on_change_functions:
+            self._on_change_functions.remove(function)
+
+    def _changed(self) -> None:
+        for function in self._on_change_functions:
+            function()
+
+    def get_columns_names(self) -> list[str]:
+        return self._columns_names
+
+    def get_columns_number(self) -> int:
+        return len(self._columns_names)
+
+    def get_rows_number(self) -> int:
+        """Returns the number of rows indexed for now"""
+        return len(self._offsets) - 1
+
+    def get_row(self, y: int) -> list[str]:
+        row = self._rows_cache.get(y)
+        if row is not None:
+            self._rows_cache.move_to_end(y)
+            return row
+        row = self._parse_line(self._mmap[self._offsets[y]:min(self._offsets[y + 1] - 1, self._size)])
+        self._rows_cache[y] = row
+        if len(self._rows_cache) > self.cache_size:
+            self._rows_cache.popitem(last=False)
+        return row
+
+    def get_text(self, x: int, y: int) -> str:
+        row = self.get_row(y)
+        return row[x] if x < len(row) else ''
+
+    def close(self) -> None:
+        self._rows_cache.clear()
+        if isinstance(self._mmap, mmap.mmap):
+            self._mmap.close()
+        self._file.close()
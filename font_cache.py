@@ -0,0 +1,32 @@
+from pygame import font
+
+class FontCache:
+    """
+    Fonts shared by all the elements of the process.
+    A font is created the first time it is asked, and deleted when no element uses it anymore.
+    """
+    _fonts: dict[tuple[str|None, int, bool, bool], font.Font] = {}
+    _references: dict[tuple[str|None, int, bool, bool], int] = {}
+
+    @classmethod
+    def get_font(cls, name: str|None, size: int, bold: bool=False, italic: bool=False) -> font.Font:
+        """Each call must be followed by a call to release_font with the same arguments once the font is not used anymore"""
+        key = (name, size, bold, italic)
+        if key not in cls._fonts:
+            cls._fonts[key] = font.SysFont(name, size, bold, italic)
+            cls._references[key] = 0
+        cls._references[key] += 1
+        return cls._fonts[key]
+
+    @classmethod
+    def release_font(cls, name: str|None, size: int, bold: bool=False, italic: bool=False) -> None:
+        key = (name, size, bold, italic)
+        if key not in cls._references: return
+        cls._references[key] -= 1
+        if cls._references[key] <= 0:
+            del cls._references[key]
+            del cls._fonts[key]
+
+    @classmethod
+    def get_fonts_number(cls) -> int:
+        return len(cls._fonts)
@@ -0,0 +1,191 @@
+from typing import Any, Callable, Generic, Iterable, Iterator, TypeVar
+from bisect import bisect_right
+from itertools import chain, islice
+from fenwick_tree import FenwickTree
+
+T = TypeVar('T')
+
+class IndexedList(Generic[T]):
+    """
+    A list split in blocks of bounded size, with a Fenwick tree of the blocks sizes,
+    so getting the value at an index is O(log n), and inserting or removing it is O(log n) plus the size of a block, amortized:
+    when a block is split (once it has twice the block size) or removed (once it is empty), the blocks sizes and indexes
+    are computed again in O(n / block size), and this happens at most once per block size insertions or removals in a block.
+    If 'unique' is True, the values must be hashable and all different, and the block of each value is stored,
+    so the index of a value is found in O(log n) plus the size of a block too (else it is O(n)).
+    """
+    _BLOCK_SIZE = 256
+
+    def __init__(self, values: Iterable[T]|None=None, unique: bool=False) -> None:
+        self.unique = unique
+        self._blocks: list[list[T]] = []
+        self._blocks_sizes = FenwickTree()
+        self._blocks_indexes: dict[int, int] = {} # the index of each block in _blocks, by its id
+        self._values_blocks: dict[T, list[T]] = {} # the block of each value, if unique
+        if values is not None:
+            self._set_values(list(values))
+
+    def _set_values(self, values: list[T]) -> None:
+        self._blocks = [values[start:start + self._BLOCK_SIZE] for start in range(0, len(values), self._BLOCK_SIZE)]
+        self._update_blocks()
+        if self.unique:
+            self._values_blocks = {value: block for block in self._blocks for value in block}
+
+    def _update_blocks(self) -> None:
+        """Compute the blocks sizes and indexes again after a block was added or removed, in O(n / block size)"""
+        self._blocks_sizes = FenwickTree([len(block) for block in self._blocks])
+        self._blocks_indexes = {id(block): index for index, block in enumerate(self._blocks)}
+
+    def __len__(self) -> int:
+        return self._blocks_sizes.get_total()
+
+    def __iter__(self) -> Iterator[T]:
+        return chain.from_iterable(self._blocks)
+
+    def __contains__(self, value: Any) -> bool:
+        if self.unique:
+            return value in self._values_blocks
+        return any(value in block for block in self._blocks)
+
+    def _locate(self, index: int) -> tuple[int, int]:
+        """Returns the index of the block containing the value at the given index, and the index of the value in it"""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("IndexedList index out of range")
+        block_index = self._blocks_sizes.find(index)
+        return block_index, index - self._blocks_sizes.prefix_sum(block_index)
+
+    def __getitem__(self, index: int|slice) -> T|list[T]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return list(self)[index]
+            return self.get_range(start, stop)
+        block_index, value_index = self._locate(index)
+        return self._blocks[block_index][value_index]
+
+    def get_range(self, start: int, end: int) -> list[T]:
+        """Returns the values from start to end, in O(log n + end - start)"""
+        start = max(0, start)
+        end = min(len(self), end)
+        if start >= end:
+            return []
+        block_index, value_index = self._locate(start)
+        return list(islice(chain(islice(self._blocks[block_index], value_index, None), *self._blocks[block_index + 1:]), end - start))
+
+    def index(self, value: T) -> int:
+        if not self.unique:
+            for index, list_value in enumerate(self):
+                if list_value == value:
+                    return index
+            raise ValueError(f"{value!r} is not in the IndexedList")
+        block = self._values_blocks.get(value)
+        if block is None:
+            raise ValueError(f"{value!r} is not in the IndexedList")
+        return self._blocks_sizes.prefix_sum(self._blocks_indexes[id(block)]) + block.index(value)
+
+    def insert(self, index: int, value: T) -> None:
+        length = len(self)
+        if index < 0:
+            index = max(0, index + length)
+        index = min(index, length)
+        if not self._blocks:
+            self._blocks.append([])
+            self._update_blocks()
+        if index == length:
+            block_index = len(self._blocks) - 1
+            value_index = len(self._blocks[block_index])
+        else:
+            block_index, value_index = self._locate(index)
+        block = self._blocks[block_index]
+        block.insert(value_index, value)
+        if self.unique:
+            self._values_blocks[value] = block
+        if len(block) > 2 * self._BLOCK_SIZE:
+            self._split_block(block_index)
+        else:
+            self._blocks_sizes.set(block_index, len(block))
+
+    def _split_block(self, block_index: int) -> None:
+        block = self._blocks[block_index]
+        new_block = block[self._BLOCK_SIZE:]
+        del block[self._BLOCK_SIZE:]
+        self._blocks.insert(block_index + 1, new_block)
+        if self.unique:
+            for value in new_block:
+                self._values_blocks[value] = new_block
+        self._update_blocks()
+
+    def append(self, value: T) -> None:
+        self.insert(len(self), value)
+
+    def extend(self, values: Iterable[T]) -> None:
+        values = list(values)
+        if not values: return
+        if self._blocks and len(self._blocks[-1]) < self._BLOCK_SIZE:
+            # fill the last block first
+            last_block = self._blocks[-1]
+            nb_values = self._BLOCK_SIZE - len(last_block)
+            last_block.extend(values[:nb_values])
+            if self.unique:
+                for value in values[:nb_values]:
+                    self._values_blocks[value] = last_block
+            values = values[nb_values:]
+        new_blocks = [values[start:start + self._BLOCK_SIZE] for start in range(0, len(values), self._BLOCK_SIZE)]
+        self._blocks.extend(new_blocks)
+        if self.unique:
+            for block in new_blocks:
+                for value in block:
+                    self._values_blocks[value] = block
+        self._update_blocks()
+
+    def pop(self, index: int = -1) -> T:
+        block_index, value_index = self._locate(index)
+        block = self._blocks[block_index]
+        value = block.pop(value_index)
+        if self.unique:
+            del self._values_blocks[value]
+        if not block:
+            del self._blocks[block_index]
+            self._update_blocks()
+        else:
+            self._blocks_sizes.set(block_index, len(block))
+        return value
+
+    def __delitem__(self, index: int) -> None:
+        self.pop(index)
+
+    def remove(self, value: T) -> None:
+        self.pop(self.index(value))
+
+    def move(self, from_index: int, to_index: int) -> None:
+        """Move the value at from_index so it is at to_index once moved"""
+        self.insert(to_index, self.pop(from_index))
+
+    def bisect(self, value: Any, key: Callable[[T], Any]|None=None) -> int:
+        """
+        Returns the index where the value would be inserted to keep the list sorted (after the equal values),
+        in O(log n) comparisons, if the list is sorted by the key.
+        """
+        if key is None:
+            key = lambda list_value: list_value
+        block_index = bisect_right(self._blocks, value, key=lambda block: key(block[0]))
+        if block_index == 0:
+            return 0
+        block_index -= 1
+        return self._blocks_sizes.prefix_sum(block_index) + bisect_right(self._blocks[block_index], value, key=key)
+
+    def insert_sorted(self, value: T, key: Callable[[T], Any]|None=None) -> int:
+        """Insert the value after the equal values if the list is sorted by the key, and returns its index"""
+        index = self.bisect(value if key is None else key(value), key)
+        self.insert(index, value)
+        return index
+
+    def clear(self) -> None:
+        self._blocks.clear()
+        self._values_blocks.clear()
+        self._update_blocks()
+
+    def copy(self) -> "IndexedList[T]":
+        return IndexedList(self, self.unique)
@@ -1,6 +1,8 @@
 from ui_element import UIElement
 from ui_manager_interface import UIManagerInterface
 from label import Label
+from text_render_cache import TextRenderCache
+from text_buffer import TextBuffer
 
 import pygame
 
@@ -41,10 +43,11 @@ class InputTextBox(Label):
         self._min_height = min_height
         # the caret is the little be who is displayed when you write text
         self._caret_width = 1
-        self._caret_x = len(text)
+        self._buffer = TextBuffer(text) # the caret is at the gap of the buffer
         self.is_placeholder_displayed = False
         self.text_displacement = 0
         self.show_caret = False
+        self._edited = False # whether the text or the caret changed since the last update
         super().__init__(
             ui_manager,
             text,
@@ -62,9 +65,24 @@ class InputTextBox(Label):
         self._can_have_focus = True
         self.was_focused = False
         if self.parent is not None:
-            self.parent.update_element()
+            self.parent.ask_layout_update()
+
+    @property
+    def _text(self) -> str:
+        return self._buffer.get_text()
+
+    @_text.setter
+    def _text(self, text: str) -> None:
+        self._buffer.set_text(text)
+
+    def update_font(self) -> None:
+        previous_font = self._font
+        super().update_font()
+        if self._font is not previous_font:
+            self._buffer.set_font(self._font)
     
     def update(self) -> None:
+        self.apply_edits()
         if self.was_focused and self._unclicked:
             self.set_caret_to_pos()
         if self._focus and not self.was_focused:
@@ -79,10 +97,10 @@ class InputTextBox(Label):
             self._ui_manager.ask_refresh(self)
         return super().update()
     
-    def update_size(self) -> None:
+    def update_size(self, fill_parent: bool=True) -> None:
         width, height = self._size
         if self._relative_width or self._relative_height:
-            content_width, content_height = self.get_content_size()
+            content_width, content_height = self._get_content_size()
             content_width += 2*self._border_width
             content_height += 2*self._border_width
         if self._relative_width:
@@ -96,68 +114,72 @@ class InputTextBox(Label):
             height = self._min_height
         self._size = (width, height)
 
-    def update_element(self) -> None:
-        if not self._text:
-            self._text = self._placeholder_text
+    def measure(self) -> None:
+        if not len(self._buffer):
+            self._buffer.set_text(self._placeholder_text, 0)
             self.is_placeholder_displayed = True
-        super().update_element()
+        super().measure()
 
     def process_event(self, event: pygame.event.Event) -> None:
         modified = False
         if event.type == pygame.TEXTINPUT:
-            text = ''
-            for char in event.text:
-                if (self.forbidden_chars is None or char not in self.forbidden_chars) and (self.allowed_chars is None or char in self.allowed_chars):
-                    text += char
+            text = ''.join(char for char in event.text if (self.forbidden_chars is None or char not in self.forbidden_chars) and (self.allowed_chars is None or char in self.allowed_chars))
             if self.is_placeholder_displayed:
                 self.is_placeholder_displayed = False
-                self._text = ""
-            self._text = self._text[:self._caret_x] + text + self._text[self._caret_x:]
-            self._caret_x += len(text)
+                self._buffer.set_text('')
+            self._buffer.insert(text)
             modified = True
         elif event.type == pygame.KEYDOWN:
             if event.key == pygame.K_BACKSPACE:
-                if not self.is_placeholder_displayed and self._caret_x > 0:
-                    self._text = self._text[:self._caret_x - 1] + self._text[self._caret_x:]
-                    self._caret_x -= 1
+                if not self.is_placeholder_displayed and self._buffer.get_caret() > 0:
+                    self._buffer.delete_before()
                     modified = True
             elif event.key == pygame.K_DELETE:
-                if not self.is_placeholder_displayed and self._caret_x < len(self._text):
-                    self._text = self._text[:self._caret_x] + self._text[self._caret_x + 1:]
+                if not self.is_placeholder_displayed and self._buffer.get_caret() < len(self._buffer):
+                    self._buffer.delete_after()
                     modified = True
             elif event.key == pygame.K_RETURN:
                 if self.loose_focus_on_enter:
                     self._ui_manager.set_focus(None)
             elif event.key == pygame.K_LEFT:
-                if self._caret_x > 0:
-                    self._caret_x -= 1
+                if self._buffer.get_caret() > 0:
+                    self._buffer.move_caret(self._buffer.get_caret() - 1)
                     modified = True
             elif event.key == pygame.K_RIGHT:
-                if self._caret_x < len(self._text) and not self.is_placeholder_displayed:
-                    self._caret_x += 1
+                if self._buffer.get_caret() < len(self._buffer) and not self.is_placeholder_displayed:
+                    self._buffer.move_caret(self._buffer.get_caret() + 1)
                     modified = True
         if modified:
-            self.update_element()
-            if self.parent is not None:
-                self.parent.update_element()
-            self._ui_manager.ask_refresh()
+            # the layout is updated once per frame, in the update method
+            self._edited = True
+            self._ui_manager.ask_update(self)
+
+    def apply_edits(self) -> None:
+        """
+        Ask a layout update after the text or the caret changed.
+        If the size of the element doesn't change, only the element is displayed again,
+        else its parents are measured again too (see UIManager.update_layout).
+        """
+        if not self._edited: return
+        self._edited = False
+        self.ask_layout_update()
     
     def set_caret_to_pos(self) -> None:
         self.show_caret = True
         if self.is_placeholder_displayed:
-            self._caret_x = 0
+            self._buffer.move_caret(0)
             self._ui_manager.ask_refresh(self)
             return
         px = pygame.mouse.get_pos()[0]
         px -= self._start_coords[0] - self._border_width
-        for i in range(len(self._fit_text)):
-            if self._font.size(self._fit_text[:i + 1])[0] > px:
-                self._caret_x = self.text_displacement + i
-                break
+        # the caret is put before the first displayed character ending after px
+        index = self._buffer.get_index_at_width(self._buffer.get_prefix_width(self.text_displacement) + px)
+        if index < self.text_displacement + len(self._fit_text):
+            self._buffer.move_caret(max(index, self.text_displacement))
         self._ui_manager.ask_refresh(self)
 
-    def get_caret_pos(self) -> None:
-        return self._border_width + self._font.size(self._text[self.text_displacement:self._caret_x])[0] + 1
+    def get_caret_pos(self) -> int:
+        return self._border_width + self._buffer.get_width(self.text_displacement, self._buffer.get_caret()) + 1
 
     def display_text(self) -> None:
         text_color = None
@@ -170,15 +192,15 @@ class InputTextBox(Label):
                 text_color = self.get_theme_value('placeholder-color')
             else:
                 text_color = self.get_theme_value('text-color')
-        self._ui_manager.get_window().blit(self._font
-            .render(self._fit_text, self.get_theme_value('antialias'), text_color), (self._start_coords[0] + self._border_width, self._start_coords[1] + self._border_width))
+        self._ui_manager.get_window().blit(TextRenderCache
+            .render(self._font, self._fit_text, self.get_theme_value('antialias'), text_color), (self._start_coords[0] + self._border_width, self._start_coords[1] + self._border_width))
 
     def display_caret(self) -> None:
         x1, y1 = self.get_start_coords()
         x1 += self.get_caret_pos()
         y2 = y1 + self.get_size()[1] - self._border_width - 2
         y1 += self._border_width + 1
-        pygame.draw.line(self._ui_manager.window, self.get_theme_value('caret-color'), (x1, y1), (x1, y2))
+        pygame.draw.line(self._ui_manager.get_window(), self.get_theme_value('caret-color'), (x1, y1), (x1, y2))
 
     def _display(self) -> None:
         super()._display()
@@ -189,27 +211,23 @@ class InputTextBox(Label):
         """
         Set in 'self._fit_text' the text who can be entirely displayed with the actual size
         """
+        caret = self._buffer.get_caret()
         if not self.is_placeholder_displayed and not self._relative_width:
-            while self.get_caret_pos() > self.get_size()[0] - self._border_width:
-                self.text_displacement += 1
-            while self._caret_x < self.text_displacement:
-                self.text_displacement -= 1
-        text = self._text[self.text_displacement:]
-        if not text:
+            # the smallest displacement keeping the caret in the box
+            max_caret_width = self.get_size()[0] - 2*self._border_width - 1
+            min_displacement_width = self._buffer.get_prefix_width(caret) - max_caret_width
+            if min_displacement_width > 0:
+                self.text_displacement = max(self.text_displacement, self._buffer.get_index_at_width(min_displacement_width - 1) + 1)
+            self.text_displacement = min(self.text_displacement, caret)
+        if self.text_displacement >= len(self._buffer):
             self._fit_text = ''
             return
         if self._relative_width:
-            self._fit_text = text
+            self._fit_text = self._buffer.get_slice(self.text_displacement, len(self._buffer))
         else:
-            element_width = self._size[0]
-            width = 0
-            self._fit_text = ''
-            for char in text:
-                width = self._font.size(self._fit_text + char)[0]
-                if width > element_width:
-                    break
-                self._fit_text += char
-        if not self._relative_height:
+            end = self._buffer.get_index_at_width(self._buffer.get_prefix_width(self.text_displacement) + self._size[0])
+            self._fit_text = self._buffer.get_slice(self.text_displacement, end)
+        if not self._relative_height and self._font is not None:
             if self._font.size(self._fit_text)[1] + 2*self._border_width > self._size[1]:
                 self._fit_text = ''
     
@@ -1,7 +1,9 @@
 from ui_element import UIElement
 from ui_manager_interface import UIManagerInterface
 from text_button import TextButton
-from typing import Callable
+from paged_data_source import PagedDataSource
+from indexed_list import IndexedList
+from typing import Callable, AsyncIterable, Iterable
 from pygame import Surface
 from typing import Any
 from copy import copy
@@ -26,14 +28,36 @@ class ItemList(UIElement):
             items_classes_names: list[str]|None=None,
             items_childs_classes_names: list[str]|None=None,
             on_select_item_function: Callable[[TextButton], None]|None=None,
-            background_image: str|Surface|None=None) -> None:
+            background_image: str|Surface|None=None,
+            virtualized: bool=False) -> None:
+        """
+        A scrollable list of texts who can be selected.
+        If 'virtualized' is True, only the texts are stored, and only the rows who can be displayed
+        with the actual height are created. They are reused for other texts when the list is scrolled.
+        A virtualized list can also pull its texts by pages from a data source (see set_data_source).
+        The rows (or the texts if the list is virtualized) are stored in an IndexedList and their coords are computed from their index,
+        so inserting, removing or moving a text anywhere is O(log n), and only the displayed rows are updated.
+        """
         if theme_elements_name is None:
             theme_elements_name = []
         theme_elements_name.append('item-list')
         self.elements_height = elements_height if elements_height is not None else self._DEFAULT_ELEMENT_HEIGHT
-        self._elements: list[TextButton] = []
+        self._elements: IndexedList[TextButton] = IndexedList(unique=True) # the rows if the list is virtualized
+        self.virtualized = virtualized
+        self._items: IndexedList[str] = IndexedList() # the texts if the list is virtualized
+        self._first_row_index = 0 # the index of the text displayed by the first row if the list is virtualized
+        self._selected_index: int|None = None # the index of the selected text if the list is virtualized
+        self._updating_rows = False # creating a row updates its parent, so the rows would be updated again
+        self._displayed_rows: list[TextButton] = [] # the rows in the list with the actual scroll, the only ones updated and displayed
+        self._data_source: PagedDataSource|None = None
+        self._data_source_error: Exception|None = None # the exception raised by the data source, who stopped the paging
+        self._on_data_source_error_function: Callable[[Exception], None]|None = None
+        self._nb_placeholder_rows = 0 # the rows displayed after the texts while a page is loading
+        self.placeholder_text = ''
         self.scroll_shift = (0, 0)
         self.max_child_size = 0
+        self._rows_to_measure: set[TextButton] = set() # the rows created since the last measure of the list, whose widths are not known yet
+        self._measured_rows: set[TextButton] = set() # the rows measured with the list since it was last arranged
         super().__init__(
             ui_manager,
             x,
@@ -57,52 +81,189 @@ class ItemList(UIElement):
         for element in self._elements:
             element.update_theme(theme_dict, erase)
     
-    def add_element(self, text: str) -> None:
-        self._elements.append(TextButton(
+    def _get_row_coords(self, index: int) -> tuple[int, int]:
+        return -self.scroll_shift[0] * self._SIZE_SCROLL_SHIFT, index * self.elements_height - self.scroll_shift[1] * self._SIZE_SCROLL_SHIFT
+
+    def _create_row(self, text: str, index: int) -> TextButton:
+        row = TextButton(
             self._ui_manager,
             text,
             on_click_function=self.set_selected_child,
-            y=len(self._elements) * self.elements_height,
+            x=self._get_row_coords(index)[0],
+            y=self._get_row_coords(index)[1],
             height=self.elements_height,
             classes_names=self.items_classes_names.copy(),
             childs_classes_names=self.items_childs_classes_names,
             parent=self,
             visible=self._visible
-            )
         )
-        self._elements[-1]._can_have_focus = True
-        self._elements[-1].fill_parent_width = True
-        self.max_child_size = max(self.max_child_size, self._elements[-1]._size[0])
+        row._can_have_focus = True
+        row.fill_parent_width = True
+        if not self.virtualized:
+            self._rows_to_measure.add(row)
+        return row
+
+    def _add_row_width(self, width: int) -> None:
+        self.max_child_size = max(self.max_child_size, width)
         if self._relative_width:
             self._size = (self.max_child_size, self._size[1])
-        self._ui_manager.ask_refresh()
-        self.update_element()
+
+    def add_element(self, text: str) -> None:
+        if self.virtualized:
+            self._items.append(text)
+        else:
+            self._elements.append(self._create_row(text, len(self._elements)))
+        self.ask_layout_update()
     
     def add_elements(self, texts: list[str]) -> None:
-        for text in texts:
-            self._elements.append(TextButton(
-                self._ui_manager,
-                text,
-                on_click_function=self.set_selected_child,
-                y=len(self._elements) * self.elements_height,
-                height=self.elements_height,
-                classes_names=self.items_classes_names.copy(),
-                childs_classes_names=self.items_childs_classes_names,
-                parent=self,
-                visible=self._visible
-                )
-            )
-            self._elements[-1]._can_have_focus = True
-            self._elements[-1].fill_parent_width = True
-            self.max_child_size = max(self.max_child_size, self._elements[-1]._size[0])
-            if self._relative_width:
-                self._size = (self.max_child_size, self._size[1])
-        self._ui_manager.ask_refresh()
-        self.update_element()
-    
+        if self.virtualized:
+            self._items.extend(texts)
+        else:
+            for text in texts:
+                self._elements.append(self._create_row(text, len(self._elements)))
+        self.ask_layout_update()
+
+    def get_items_number(self) -> int:
+        """If the list is virtualized, the placeholder rows are counted"""
+        return len(self._items) + self._nb_placeholder_rows if self.virtualized else len(self._elements)
+
+    def _get_item_text(self, index: int) -> str:
+        return self._items[index] if index < len(self._items) else self.placeholder_text
+
+    def set_data_source(
+            self,
+            data_source: Iterable[str]|AsyncIterable[str]|PagedDataSource|None,
+            page_size: int = 50,
+            placeholder_text: str = '...',
+            on_error_function: Callable[[Exception], None]|None = None) -> None:
+        """
+        Pull the texts of a virtualized list from an iterable or an async iterable (see PagedDataSource),
+        by pages of 'page_size' texts, each time the list is scrolled near its end.
+        The texts are loaded without blocking, and 'page_size' rows showing 'placeholder_text' are displayed while a page is loading.
+        The texts already in the list are kept. If data_source is None, stops pulling texts from the actual source.
+        If the source raises an exception while loading a page, the paging stops, the loaded texts are kept,
+        and the exception is given to 'on_error_function' and returned by get_data_source_error.
+        """
+        if not self.virtualized:
+            raise ValueError("Can't use a data source with a list who is not virtualized")
+        if self._data_source is not None:
+            self._data_source.close()
+        if data_source is not None and not isinstance(data_source, PagedDataSource):
+            data_source = PagedDataSource(data_source, page_size)
+        self._data_source = data_source
+        self._data_source_error = None
+        self._on_data_source_error_function = on_error_function
+        self.placeholder_text = placeholder_text
+        self._nb_placeholder_rows = 0
+        self._request_page_if_needed()
+        self.ask_layout_update()
+        self._ui_manager.ask_refresh(self)
+
+    def _request_page_if_needed(self) -> None:
+        """Ask the next page to the data source if the displayed rows are less than a page away from the last text"""
+        if self._data_source is None or self._data_source.is_loading() or self._data_source.is_exhausted(): return
+        last_displayed_index = self._get_visible_rows_range().stop
+        if last_displayed_index + self._data_source.page_size < len(self._items): return
+        self._data_source.request_page()
+        self._nb_placeholder_rows = self._data_source.page_size
+        self._ui_manager.ask_update(self)
+
+    def get_data_source_error(self) -> Exception|None:
+        """Returns the exception who stopped the paging of the data source, if any (see set_data_source)"""
+        return self._data_source_error
+
+    def _update_data_source(self) -> None:
+        try:
+            page = self._data_source.get_page()
+        except Exception as error:
+            self._stop_data_source(error)
+            return
+        if page is None:
+            self._ui_manager.ask_update(self)
+            return
+        self._nb_placeholder_rows = 0
+        self._items.extend(page)
+        self._request_page_if_needed()
+        self.ask_layout_update()
+
+    def _stop_data_source(self, error: Exception) -> None:
+        """Stop pulling texts from the data source after it raised an exception, and remove the placeholder rows"""
+        self._data_source.close()
+        self._data_source_error = error
+        self._nb_placeholder_rows = 0
+        self.ask_layout_update()
+        self._ui_manager.ask_refresh(self)
+        if self._on_data_source_error_function is not None:
+            self._on_data_source_error_function(error)
+
+    def insert_element(self, index: int, text: str) -> None:
+        """Insert the text so it is at the given index once inserted"""
+        index = max(0, min(index, len(self._items) if self.virtualized else len(self._elements)))
+        if self.virtualized:
+            self._items.insert(index, text)
+            if self._selected_index is not None and self._selected_index >= index:
+                self._selected_index += 1
+        else:
+            self._elements.insert(index, self._create_row(text, index))
+        self.ask_layout_update()
+
+    def insert_element_sorted(self, text: str, key: Callable[[str], Any]|None=None) -> int:
+        """If the texts are sorted by the key, insert the text after the equal ones to keep them sorted, and returns its index"""
+        if key is None:
+            key = lambda text: text
+        if self.virtualized:
+            index = self._items.bisect(key(text), key)
+        else:
+            index = self._elements.bisect(key(text), lambda row: key(row.get_text()))
+        self.insert_element(index, text)
+        return index
+
+    def move_element(self, from_index: int, to_index: int) -> None:
+        """Move the text at from_index so it is at to_index once moved"""
+        nb_items = len(self._items) if self.virtualized else len(self._elements)
+        if not 0 <= from_index < nb_items:
+            raise IndexError("ItemList index out of range")
+        to_index = max(0, min(to_index, nb_items - 1))
+        if from_index == to_index: return
+        if self.virtualized:
+            self._items.move(from_index, to_index)
+            if self._selected_index is not None:
+                if self._selected_index == from_index:
+                    self._selected_index = to_index
+                elif from_index < self._selected_index <= to_index:
+                    self._selected_index -= 1
+                elif to_index <= self._selected_index < from_index:
+                    self._selected_index += 1
+        else:
+            self._elements.move(from_index, to_index)
+        # the size of the list doesn't change
+        self._update_displayed_rows()
+        self._ui_manager.ask_refresh(self)
+        self._ui_manager.ask_hover_update()
+
     def remove_element(self, element: UIElement) -> None:
-        index = self._elements.index(element)
+        """If the list is virtualized, removes the text displayed by the given row"""
         if element not in self._elements: return False
+        index = self._elements.index(element)
+        if self.virtualized:
+            index += self._first_row_index
+        self.remove_element_at(index)
+
+    def remove_element_at(self, index: int) -> None:
+        if self.virtualized:
+            if not 0 <= index < len(self._items): return # a placeholder row
+            del self._items[index]
+            if self._selected_index is not None:
+                if self._selected_index == index:
+                    self._selected_index = None
+                    self.child_selected = None
+                elif self._selected_index > index:
+                    self._selected_index -= 1
+            self.ask_layout_update()
+            self._ui_manager.ask_refresh(self)
+            return
+        if not 0 <= index < len(self._elements): return
+        element = self._elements.pop(index)
         for class_name in self.items_classes_names:
             try:
                 element.classes_names.remove(class_name)
@@ -112,10 +273,8 @@ class ItemList(UIElement):
         if self.child_selected == element:
             self.child_selected = None
         element.delete()
-        self._elements.remove(element)
-        for i in range(index, len(self._elements)):
-            self._elements[i]._first_coords = self._elements[i]._first_coords[0], self._elements[i]._first_coords[1] - self.elements_height
-        self.update_element()
+        self.ask_layout_update()
+        self._ui_manager.ask_refresh(self)
 
 
     def remove_all_elements(self) -> None:
@@ -133,25 +292,44 @@ class ItemList(UIElement):
             except ValueError:
                 pass
         self._elements.clear()
-        self.update_element()
-        self._ui_manager.ask_refresh()
+        self._items.clear()
+        self._first_row_index = 0
+        self._selected_index = None
+        # the texts of the data source are removed too, so it would page into the emptied list (like set_data_source(None))
+        if self._data_source is not None:
+            self._data_source.close()
+            self._data_source = None
+        self._data_source_error = None
+        self._nb_placeholder_rows = 0
+        self.ask_layout_update()
+        self._ui_manager.ask_refresh(self)
 
     def set_selected_child(self, element: UIElement) -> None:
+        if self.virtualized and self._first_row_index + self._elements.index(element) >= len(self._items): return # a placeholder row
         if self.child_selected is not None:
             self.child_selected.set_selected(False)
         self.child_selected = element
         self.child_selected.set_selected(True)
+        if self.virtualized:
+            self._selected_index = self._first_row_index + self._elements.index(element)
         if self.on_select_function is not None:
             self.on_select_function(self.child_selected)
 
     def get_focused_value(self) -> str|None:
+        if self.virtualized:
+            if self._selected_index is None:
+                return
+            return self._items[self._selected_index]
         if self.child_selected is None:
             return
         return self.child_selected.get_text()
 
+    def get_children(self) -> list[TextButton]:
+        return self._displayed_rows
+
     def get_content_size(self) -> tuple[int, int]:
         width = self._size[0] - 2*self._border_width if self._size[0] is not None else self._DEFAULT_ELEMENT_LENGTH
-        height = self.elements_height * len(self._elements)
+        height = self.elements_height * self.get_items_number()
         if height != 0:
             height -= 2*self._border_width
         if not self._relative_width:
@@ -161,24 +339,105 @@ class ItemList(UIElement):
         
         return width, height
 
-    def update_element(self) -> None:
-        super().update_element()
-        for element in self._elements:
-            element._first_size = self.max_child_size, element._first_size[1]
-            element._relative_width = False
-            element.update_element()
+    def measure_tree(self) -> None:
+        """
+        The rows created since the last measure are measured once with the list, to get the width of the longest one,
+        then the displayed rows are measured (see get_children).
+        """
+        for row in self._rows_to_measure:
+            if row.parent is not self: continue
+            row.measure_tree()
+            self._add_row_width(row.get_measured_size()[0])
+            self._measured_rows.add(row)
+        self._rows_to_measure.clear()
+        for row in self.get_children():
+            if row not in self._measured_rows:
+                row.measure_tree()
+        self.measure()
+
+    def arrange(self) -> None:
+        super().arrange()
+        self._update_displayed_rows()
+
+    def _get_visible_rows_range(self) -> range:
+        """
+        Returns the indexes of the rows in the visible part of the list (see fit_in_parent_rect) with the actual scroll,
+        so a list taller than its parent or than the window (like with a relative height) only has the rows who can be seen.
+        """
+        if not self.fit_in_parent_rect[3]: return range(0)
+        top = self.scroll_shift[1] * self._SIZE_SCROLL_SHIFT + self.fit_in_parent_rect[1] - self._start_coords[1]
+        bottom = top + self.fit_in_parent_rect[3]
+        return range(top // self.elements_height, -(-bottom // self.elements_height))
+
+    def _get_displayed_rows(self) -> list[tuple[int, TextButton]]:
+        """Returns the rows in the list with the actual scroll, with the index of their text"""
+        if self.virtualized:
+            return list(enumerate(self._elements, self._first_row_index))
+        visible_rows = self._get_visible_rows_range()
+        first_index = min(visible_rows.start, len(self._elements))
+        last_index = min(visible_rows.stop, len(self._elements))
+        return list(zip(range(first_index, last_index), self._elements[first_index:last_index]))
+
+    def _update_displayed_rows(self) -> None:
+        """
+        Set the coords of the rows in the list from their index and the scroll, and arrange them.
+        The rows who were already displayed were measured with the list (see get_children), so they are only arranged,
+        and the rows coming in the list are measured first, if they were not measured with the list.
+        The rows who are not in the list anymore are put out of it once, so they have an empty fit_in_parent_rect,
+        then they are skipped until they are in the list again.
+        """
+        if self._updating_rows: return
+        self._updating_rows = True
+        if self.virtualized:
+            self._update_rows()
+        previous_displayed_rows = self._displayed_rows
+        displayed_rows = self._get_displayed_rows()
+        self._displayed_rows = [row for _, row in displayed_rows]
+        kept_rows = set(self._displayed_rows)
+        for row in previous_displayed_rows:
+            if row in kept_rows or row.parent is not self: continue
+            row._first_coords = row._first_coords[0], -self.elements_height
+            row.arrange()
+        previous_rows = set(previous_displayed_rows)
+        for index, row in displayed_rows:
+            row._first_coords = self._get_row_coords(index)
+            row._first_size = self.max_child_size, row._first_size[1]
+            row._relative_width = False
+            if row not in previous_rows and row not in self._measured_rows:
+                row.measure_tree()
+            row.arrange()
+        self._measured_rows.clear()
+        self._updating_rows = False
     
-    def _display(self) -> None:
-        super()._display()
-        for element in self._elements:
-            element._display()
+    def _update_rows(self) -> None:
+        """
+        Create or delete rows to have enough of them to fill the visible part of the list,
+        then give them the texts who can be displayed with the actual scroll.
+        """
+        visible_rows = self._get_visible_rows_range()
+        self._first_row_index = min(visible_rows.start, self.get_items_number())
+        nb_rows = max(min(visible_rows.stop, self.get_items_number()) - self._first_row_index, 0)
+        while len(self._elements) > nb_rows:
+            row = self._elements.pop()
+            row.parent = None
+            row.delete()
+        while len(self._elements) < nb_rows:
+            self._elements.append(self._create_row('', self._first_row_index + len(self._elements)))
+        self.child_selected = None
+        for index, row in enumerate(self._elements, self._first_row_index):
+            text = self._get_item_text(index)
+            if row.get_text() != text:
+                row.label.set_text_keeping_size(text) # the rows are arranged just after
+            row.set_selected(index == self._selected_index)
+            if index == self._selected_index:
+                self.child_selected = row
     
     def scroll_elements(self) -> None:
         y = self.wheel_move[1]
         if y >= 0:
             y = min(y, self.scroll_shift[1])
         if y <= 0:
-            if self.fit_in_parent_rect[3] >= self.elements_height * len(self._elements) - self.scroll_shift[1] * self._SIZE_SCROLL_SHIFT:
+            if self.fit_in_parent_rect[3] >= self.elements_height * self.get_items_number() - self.scroll_shift[1] * self._SIZE_SCROLL_SHIFT:
                 y = 0
         x = self.wheel_move[0]
         if x >= 0:
@@ -188,20 +447,23 @@ class ItemList(UIElement):
                 x = 0
         if x == 0 and y == 0: return
         self.scroll_shift = self.scroll_shift[0] - x, self.scroll_shift[1] - y
-        for element in self._elements:
-            element._first_coords = (element._first_coords[0] + self._SIZE_SCROLL_SHIFT * x, element._first_coords[1] + self._SIZE_SCROLL_SHIFT * y)
-        self.update_element()
-        self._ui_manager.ask_refresh()
+        self._request_page_if_needed()
+        # the size and the coords of the list don't change, so only the displayed rows are updated
+        self._update_displayed_rows()
+        self._ui_manager.ask_refresh(self)
+        self._ui_manager.ask_hover_update()
 
     def update(self) -> None:
         if self.wheel_move[0] != 0 or self.wheel_move[1] != 0:
             self.scroll_elements()
+        if self._data_source is not None and self._data_source.is_loading():
+            self._update_data_source()
         super().update()
 
     def _display(self) -> None:
         super()._display()
-        for element in self._elements:
-            element._display()
+        for element in self._displayed_rows:
+            element.display_clipped()
 
     def set_visibility(self, visible: bool) -> None:
         super().set_visibility(visible)
@@ -216,14 +478,17 @@ class ItemList(UIElement):
             element.set_visibility(self._visible)
 
     def __copy__(self) -> "ItemList":
-        item_list_copy = ItemList(self._ui_manager, self.elements_height, *self._first_coords, *self._first_size, self.anchor, self._visible, None, self.theme_elements_name, self.classes_names, self.background_image)
-        item_list_copy._elements = [copy(element) for element in self._elements]
+        item_list_copy = ItemList(self._ui_manager, self.elements_height, *self._first_coords, *self._first_size, self.anchor, self._visible, None, self.theme_elements_name, self.classes_names, self.background_image, virtualized=self.virtualized)
+        item_list_copy._items = self._items.copy()
+        item_list_copy._elements = IndexedList((copy(element) for element in self._elements), unique=True)
         for element in item_list_copy._elements:
             element.parent = item_list_copy
         item_list_copy.update_element()
         return item_list_copy
 
     def delete(self) -> None:
+        if self._data_source is not None:
+            self._data_source.close()
         for element in self._elements:
             element.delete()
         self._elements.clear()
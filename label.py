@@ -2,9 +2,14 @@ from typing import Any
 from ui_element import UIElement
 from ui_manager_interface import UIManagerInterface
 
+from font_cache import FontCache
+from text_render_cache import TextRenderCache
+
 from pygame import font, Surface
 
 class Label(UIElement):
+    ELLIPSIS = '...'
+
     def __init__(
             self,
             ui_manager: UIManagerInterface,
@@ -24,6 +29,7 @@ class Label(UIElement):
         """
         self._text = text
         self._font: font.Font|None = None
+        self._font_key: tuple[str|None, int, bool, bool]|None = None # arguments given to the font cache
         if theme_elements_name is None:
             theme_elements_name = []
         theme_elements_name.append('label')
@@ -48,38 +54,69 @@ class Label(UIElement):
         super().update_theme(theme_dict, erase)
         self.update_font()
 
-    def update_element(self) -> None:
+    def measure(self) -> None:
+        self.update_fit_text()
+        super().measure()
+
+    def arrange(self) -> None:
+        super().arrange()
         self.update_fit_text()
-        super().update_element()
 
     def update_font(self) -> None:
-        self._font = font.SysFont(
+        font_key = (
             self.get_theme_value('font-name'),
-            self.get_theme_value('font-size')
+            self.get_theme_value('font-size'),
+            bool(self.get_theme_value('font-bold')),
+            bool(self.get_theme_value('font-italic'))
         )
+        if font_key == self._font_key: return
+        self._font = FontCache.get_font(*font_key)
+        self.release_font()
+        self._font_key = font_key
+
+    def release_font(self) -> None:
+        if self._font_key is not None:
+            FontCache.release_font(*self._font_key)
+            self._font_key = None
 
     def update_fit_text(self) -> None:
         """
-        Set in 'self._fit_text' the text who can be entirely displayed with the actual size
+        Set in 'self._fit_text' the text who can be entirely displayed with the actual size.
+        If the 'text-ellipsis' theme value is set, a cut text ends with an ellipsis.
         """
         if not self._text:
             self._fit_text = ''
             return
-        if self._relative_width:
+        if self._relative_width or self._font is None: # no font until the theme is resolved (see UIManager.batch)
             self._fit_text = self._text
         else:
             element_width = self._size[0]
-            width = 0
-            self._fit_text = ''
-            for char in self._text:
-                width = self._font.size(self._fit_text + char)[0]
-                if width > element_width:
-                    break
-                self._fit_text += char
-        if not self._relative_height:
+            fit_text_length = self.get_fit_text_length(self._text, element_width)
+            self._fit_text = self._text[:fit_text_length]
+            if fit_text_length < len(self._text) and self.get_theme_value('text-ellipsis'):
+                ellipsis_width = self._font.size(self.ELLIPSIS)[0]
+                if ellipsis_width <= element_width:
+                    self._fit_text = self._text[:self.get_fit_text_length(self._text, element_width - ellipsis_width)] + self.ELLIPSIS
+        if not self._relative_height and self._font is not None:
             if self._font.size(self._fit_text)[1] > self._size[1]:
                 self._fit_text = ''
 
+    def get_fit_text_length(self, text: str, width: int) -> int:
+        """
+        Returns the length of the longest start of the text who can be displayed in the given width.
+        Uses a binary search on the length, so the text is only measured O(log n) times.
+        """
+        if self._font.size(text)[0] <= width:
+            return len(text)
+        fit_length, too_long_length = 0, len(text)
+        while too_long_length - fit_length > 1:
+            length = (fit_length + too_long_length) // 2
+            if self._font.size(text[:length])[0] <= width:
+                fit_length = length
+            else:
+                too_long_length = length
+        return fit_length
+
     def get_text_size(self) -> tuple[int, int]:
         if self._font is None:
             return (0, 0)
@@ -103,27 +140,14 @@ class Label(UIElement):
             start_x = self._size[0] // 2 - text_size[0] // 2
         if self.get_theme_value('vertical-center'):
             start_y = self._size[1] // 2 - text_size[1] // 2
-        text = self._fit_text
         start_x += self._start_coords[0]
         start_y += self._start_coords[1]
-        if self.parent is not None:
-            if start_y < self.parent.fit_in_parent_rect[1] or start_y + text_size[1] > self.parent.fit_in_parent_rect[1] + self.parent.fit_in_parent_rect[3]:
-                return
-            while text and start_x < self.parent.fit_in_parent_rect[0]:
-                char_length = self._font.size(text[0])[0]
-                text = text[1:]
-                start_x += char_length
-                text_size = text_size[0] - char_length, text_size[1]
-            while text and start_x + text_size[0] > self.parent.fit_in_parent_rect[0] + self.parent.fit_in_parent_rect[2]:
-                text = text[:-1]
-                text_size = self._font.size(text)
-
-        text_rendered = self._font.render(text,
+        # the parts out of the parent are cut by the window clip (see display_clipped)
+        text_rendered = TextRenderCache.render(self._font,
+                            self._fit_text,
                             self.get_theme_value('antialias'),
-                            text_color)
-        transparency = self.get_theme_value('text-transparency')
-        if transparency is not None:
-            text_rendered.set_alpha(transparency)
+                            text_color,
+                            self.get_theme_value('text-transparency'))
         self._ui_manager.get_window().blit(text_rendered,
                     (start_x, start_y)
         )
@@ -137,8 +161,16 @@ class Label(UIElement):
     
     def set_text(self, text: str) -> None:
         self._text = text
-        self.update_element()
-        self._ui_manager.ask_refresh()
+        self.ask_layout_update()
+
+    def set_text_keeping_size(self, text: str) -> None:
+        """
+        Set the text without asking a layout update, for a label whose size doesn't depend on its text
+        (like the label of a row of an ItemList, whose size is set by the list).
+        The fit text is updated the next time the label is arranged.
+        """
+        self._text = text
+        self._content_size = None
     
     def get_text(self) -> str:
         return self._text
@@ -147,24 +179,32 @@ class Label(UIElement):
         super().update()
     
     def set_selected(self, selected: bool) -> None:
+        if selected == self._selected: return
         super().set_selected(selected)
         if self.get_theme_value('selected-text-color') is not None:
             self._ui_manager.ask_refresh(self)
 
     def set_clicked(self, clicked: bool) -> None:
+        if clicked == self._clicked: return
         super().set_clicked(clicked)
         if self.get_theme_value('clicked-text-color') is not None:
             self._ui_manager.ask_refresh(self)
 
     def set_unclicked(self, unclicked: bool) -> None:
+        if unclicked == self._unclicked: return
         super().set_unclicked(unclicked)
         if self.get_theme_value('unclicked-text-color') is not None:
             self._ui_manager.ask_refresh(self)
 
     def set_hovered(self, hovered: bool) -> None:
+        if hovered == self._hovered: return
         super().set_hovered(hovered)
         if self.get_theme_value('hovered-text-color') is not None:
             self._ui_manager.ask_refresh(self)
 
     def __copy__(self) -> "Label":
         return Label(self._ui_manager, self._text, *self._first_coords, *self._first_size, self.anchor, self._visible, None, self.theme_elements_name, self.classes_names, self.background_image)
+
+    def delete(self) -> None:
+        self.release_font()
+        super().delete()
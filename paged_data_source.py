@@ -0,0 +1,108 @@
+from typing import AsyncIterable, Iterable
+from collections.abc import AsyncIterable as AsyncIterableABC
+from concurrent.futures import Future
+from itertools import islice
+from threading import Thread
+import asyncio
+
+class PagedDataSource:
+    """
+    Pulls texts by pages from an iterable or an async iterable, without blocking the caller:
+    an iterable is read in a daemon thread for each page, and an async iterable is read in the given event loop
+    (who must be running, in any thread), or in an event loop running in a daemon thread if no loop is given.
+    A page is asked with request_page, then get_page returns it once it is loaded.
+    A page of an iterable who is already loading can't be stopped by close, but its thread doesn't keep the program running.
+    """
+    def __init__(self, source: Iterable[str]|AsyncIterable[str], page_size: int = 50, loop: asyncio.AbstractEventLoop|None = None) -> None:
+        self.page_size = page_size
+        self._exhausted = False
+        self._closed = False
+        self._future: Future[list[str]]|None = None
+        self._iterator = None
+        self._async_iterator = None
+        self._page_task: asyncio.Task|None = None # the task loading a page of the async iterable
+        self._loop = loop
+        self._own_loop = False
+        self._loop_thread: Thread|None = None # the thread running the event loop created if no loop is given
+        if isinstance(source, AsyncIterableABC):
+            self._async_iterator = aiter(source)
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._own_loop = True
+                self._loop_thread = Thread(target=self._loop.run_forever, daemon=True)
+                self._loop_thread.start()
+        else:
+            self._iterator = iter(source)
+
+    def _get_page(self, future: Future[list[str]]) -> None:
+        if not future.set_running_or_notify_cancel(): return
+        try:
+            future.set_result([str(item) for item in islice(self._iterator, self.page_size)])
+        except Exception as error:
+            future.set_exception(error)
+
+    async def _get_async_page(self) -> list[str]:
+        self._page_task = asyncio.current_task()
+        page = []
+        while len(page) < self.page_size:
+            try:
+                page.append(str(await anext(self._async_iterator)))
+            except StopAsyncIteration:
+                break
+        return page
+
+    def is_loading(self) -> bool:
+        return self._future is not None
+
+    def is_exhausted(self) -> bool:
+        return self._exhausted
+
+    def request_page(self) -> None:
+        """Start loading the next page, if no page is loading and the source is not exhausted"""
+        if self._future is not None or self._exhausted: return
+        if self._async_iterator is not None:
+            self._future = asyncio.run_coroutine_threadsafe(self._get_async_page(), self._loop)
+        else:
+            self._future = Future()
+            Thread(target=self._get_page, args=(self._future,), daemon=True).start()
+
+    def get_page(self) -> list[str]|None:
+        """
+        Returns the requested page if it is loaded, else None.
+        Raises the exception raised by the source while loading the page, if any.
+        """
+        if self._future is None or not self._future.done(): return None
+        future = self._future
+        self._future = None
+        page = future.result()
+        if len(page) < self.page_size:
+            self._exhausted = True
+        return page
+
+    async def _close_async_iterator(self) -> None:
+        """Wait for the cancelled page task, then close the async iterator (like an async generator, see aclose)"""
+        if self._page_task is not None and not self._page_task.done():
+            self._page_task.cancel()
+            await asyncio.wait([self._page_task])
+        aclose = getattr(self._async_iterator, 'aclose', None)
+        if aclose is not None:
+            await aclose()
+
+    def close(self) -> None:
+        """
+        Stop loading pages. An async iterator is closed in its event loop,
+        then the event loop created if no loop was given is stopped and closed.
+        """
+        if self._closed: return
+        self._closed = True
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+        self._exhausted = True
+        if self._async_iterator is None or self._loop.is_closed(): return
+        closing = asyncio.run_coroutine_threadsafe(self._close_async_iterator(), self._loop)
+        if self._own_loop:
+            closing.exception() # waits for the iterator to be closed, the exceptions raised while closing it are ignored
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join()
+            self._loop.close()
@@ -1,10 +1,16 @@
 from ui_element import UIElement
 from ui_manager_interface import UIManagerInterface
 from button import Button
-from typing import Callable
+from typing import Callable, Iterator
+from font_cache import FontCache
+from text_render_cache import TextRenderCache
+import pygame
 from pygame import Surface
 from typing import Any
 from copy import copy
+from itertools import accumulate
+from fenwick_tree import FenwickTree
+from table_data_model_interface import TableDataModelInterface
 
 class Table(UIElement):
     _SIZE_SCROLL_SHIFT = 10
@@ -26,19 +32,44 @@ class Table(UIElement):
             classes_names: list[str] | None = None,
             cells_classes_names: list[str]|None=None,
             cells_childs_classes_names: list[str]|None=None,
-            on_select_item_function: Callable[[Button], None]|None=None,
-            background_image: str|Surface|None=None) -> None:
+            on_select_item_function: Callable[[Button|tuple[int, int]], None]|None=None,
+            background_image: str|Surface|None=None,
+            cell_renderer: Callable[[Surface, pygame.Rect, Any, bool, bool], None]|bool|None=None) -> None:
+        """
+        A grid of cells.
+        If 'cell_renderer' is given, the table is in render-only mode: the cells are not buttons but values
+        (set with set_cell_value), drawn by calling cell_renderer(window, cell_rect, value, hovered, selected).
+        If 'cell_renderer' is True, the values are drawn as texts with the 'cell-*' theme values.
+        In render-only mode, 'elements_width' and 'elements_height' are needed,
+        and on_select_item_function is called with the (x, y) pos of the selected cell.
+        The values can also come from a data model (see set_data_model), who gives the texts of the displayed cells.
+        """
+        if cell_renderer is not None and (elements_width is None or elements_height is None):
+            raise ValueError("Can't use a cell renderer without elements width and height")
         if theme_elements_name is None:
             theme_elements_name = []
         self.scroll_shift = (0, 0)
         theme_elements_name.append('item-list')
+        theme_elements_name.append('table')
+        self._cell_renderer = self.render_cell_text if cell_renderer is True else cell_renderer
+        self._cells_values: list[Any] = [None] * (nb_elements_width * nb_elements_height) if self._cell_renderer is not None else []
+        self._selected_pos: tuple[int, int]|None = None # the selected cell in render-only mode
+        self._hovered_pos: tuple[int, int]|None = None # the hovered cell in render-only mode
+        self._cells_font: pygame.font.Font|None = None
+        self._cells_font_key: tuple[str|None, int, bool, bool]|None = None
+        self._data_model: TableDataModelInterface|None = None
         self.nb_elements_width = nb_elements_width
         self.nb_elements_height = nb_elements_height
         self.elements_width = elements_width
         self.elements_height = elements_height
         self._elements: list[Button] = [None for _ in range(self.nb_elements_width * self.nb_elements_height)]
-        self.max_elements_heights = [self.elements_height] * self.nb_elements_height
-        self.max_elements_widths = [self.elements_width] * self.nb_elements_width
+        self._elements_positions: dict[Button, tuple[int, int]] = {}
+        # the sizes of the columns and rows, who are the biggest sizes of their cells
+        self._columns_widths = FenwickTree([self.elements_width if self.elements_width is not None else 0] * self.nb_elements_width)
+        self._rows_heights = FenwickTree([self.elements_height if self.elements_height is not None else 0] * self.nb_elements_height)
+        self._cells_sizes: dict[Button, tuple[int, int]] = {} # the measured sizes of the cells used for the columns and rows sizes
+        self._cells_sizes_outdated = True # if True, all the cells are measured again in the next layout (see measure_tree)
+        self._displayed_elements: list[Button] = [] # the cells in the table with the actual scroll, the only ones updated and displayed
         super().__init__(
             ui_manager,
             x,
@@ -62,12 +93,140 @@ class Table(UIElement):
         for element in self._elements:
             if element is not None:
                 element.update_theme(theme_dict, erase)
+        self._cells_sizes_outdated = True
+        if self._cell_renderer == self.render_cell_text:
+            self._update_cells_font()
+
+    def _update_cells_font(self) -> None:
+        font_key = (
+            self.get_theme_value('cell-font-name'),
+            self.get_theme_value('cell-font-size'),
+            bool(self.get_theme_value('cell-font-bold')),
+            bool(self.get_theme_value('cell-font-italic'))
+        )
+        if font_key == self._cells_font_key: return
+        self._cells_font = FontCache.get_font(*font_key)
+        self._release_cells_font()
+        self._cells_font_key = font_key
+
+    def _release_cells_font(self) -> None:
+        if self._cells_font_key is not None:
+            FontCache.release_font(*self._cells_font_key)
+            self._cells_font_key = None
+
+    def set_cell_value(self, x: int, y: int, value: Any) -> None:
+        """In render-only mode, set the value of the cell (None for an empty cell)"""
+        if self._cell_renderer is None:
+            raise ValueError("Can't set a cell value without a cell renderer")
+        if self._data_model is not None:
+            raise ValueError("Can't set a cell value of a table displaying a data model")
+        self._cells_values[x + y * self.nb_elements_width] = value
+        self._ui_manager.ask_refresh(self)
+
+    def get_cell_value(self, x: int, y: int) -> Any:
+        if self._data_model is not None:
+            return self._data_model.get_text(x, y)
+        return self._cells_values[x + y * self.nb_elements_width]
+
+    def set_data_model(self, data_model: TableDataModelInterface|None) -> None:
+        """
+        In render-only mode, display the rows of the data model instead of the values set with set_cell_value.
+        The table has as many columns and rows as the model (like a TableDataModel or a FileTableDataModel),
+        and is updated each time the model changes,
+        without creating any element. The cells added with add_element are removed.
+        The table doesn't own the model, who can be shared by several tables: it is not closed when another model is set
+        or when the table is deleted, so a FileTableDataModel must be closed by its creator (see FileTableDataModel.close).
+        """
+        if self._cell_renderer is None:
+            raise ValueError("Can't use a data model without a cell renderer")
+        # the cells are deleted all at once, then the table is laid out once
+        for element in self._elements_positions:
+            element.parent = None
+            element.delete()
+        self._elements_positions.clear()
+        self._cells_sizes.clear()
+        self._displayed_elements = []
+        self.child_selected = None
+        self._elements = [None] * (self.nb_elements_width * self.nb_elements_height)
+        self._cells_sizes_outdated = True
+        if self._data_model is not None:
+            self._data_model.remove_on_change_function(self._on_data_model_change)
+        self._data_model = data_model
+        if data_model is None:
+            self._cells_values = [None] * (self.nb_elements_width * self.nb_elements_height)
+        else:
+            self._cells_values = []
+            data_model.add_on_change_function(self._on_data_model_change)
+            self._on_data_model_change()
+            self._ui_manager.ask_update(self)
+        self.ask_layout_update()
+        self._ui_manager.ask_refresh()
+
+    def get_data_model(self) -> TableDataModelInterface|None:
+        return self._data_model
+
+    def _on_data_model_change(self) -> None:
+        nb_columns = self._data_model.get_columns_number()
+        nb_rows = self._data_model.get_rows_number()
+        if (nb_columns, nb_rows) == (self.nb_elements_width, self.nb_elements_height):
+            # only the order or the texts of the rows changed
+            self._selected_pos = None
+            self._ui_manager.ask_refresh(self)
+            return
+        if nb_columns == self.nb_elements_width and nb_rows > self.nb_elements_height:
+            # rows were added at the end (like while a file is indexed), so only the new rows heights are added
+            self._rows_heights.extend([self.elements_height] * (nb_rows - self.nb_elements_height))
+            self.nb_elements_height = nb_rows
+            if self._relative_height:
+                self.ask_layout_update()
+            self._ui_manager.ask_refresh(self)
+            return
+        self._selected_pos = None
+        self.nb_elements_width = nb_columns
+        self.nb_elements_height = nb_rows
+        self._elements = []
+        self.scroll_shift = (
+            min(self.scroll_shift[0], nb_columns * self.elements_width // self._SIZE_SCROLL_SHIFT),
+            min(self.scroll_shift[1], nb_rows * self.elements_height // self._SIZE_SCROLL_SHIFT)
+        )
+        self._cells_sizes_outdated = True
+        self.ask_layout_update()
+        self._ui_manager.ask_refresh()
+
+    def get_selected_pos(self) -> tuple[int, int]|None:
+        """In render-only mode, returns the (x, y) pos of the selected cell"""
+        return self._selected_pos
+
+    def render_cell_text(self, surface: Surface, rect: pygame.Rect, value: Any, hovered: bool, selected: bool) -> None:
+        """The cell renderer used if cell_renderer is True, displaying the value as a text"""
+        background_color = None
+        if hovered:
+            background_color = self.get_theme_value('hovered-cell-background-color')
+        if background_color is None and selected:
+            background_color = self.get_theme_value('selected-cell-background-color')
+        if background_color is not None:
+            surface.fill(background_color, rect)
+        previous_clip = surface.get_clip()
+        surface.set_clip(rect.clip(previous_clip))
+        surface.blit(TextRenderCache.render(self._cells_font, str(value), self.get_theme_value('cell-antialias'), self.get_theme_value('cell-text-color')), rect.topleft)
+        surface.set_clip(previous_clip)
+        border_color = self.get_theme_value('cell-border-color')
+        if border_color is not None:
+            pygame.draw.rect(surface, border_color, rect, 1)
     
+    @property
+    def max_elements_widths(self) -> list[int]:
+        return self._columns_widths.get_values()
+
+    @property
+    def max_elements_heights(self) -> list[int]:
+        return self._rows_heights.get_values()
+
     def add_element(self, x: int, y: int) -> Button|None:
         index = x + y * self.nb_elements_width
-        if index < 0 or index > len(self._elements): return
-        previous_width = sum(self.max_elements_widths[:x])
-        previous_height = sum(self.max_elements_heights[:y])
+        if index < 0 or index >= len(self._elements): return
+        previous_width = self._columns_widths.prefix_sum(x)
+        previous_height = self._rows_heights.prefix_sum(y)
         new_element = Button(
             self._ui_manager,
             on_click_function=self.set_selected_child,
@@ -81,14 +240,23 @@ class Table(UIElement):
             visible=self._visible
         )
         self._elements[index] = new_element
+        self._elements_positions[new_element] = (x, y)
         new_element._can_have_focus = True
-        self._ui_manager.ask_refresh()
-        self.update_element()
+        self._ui_manager.ask_refresh(self)
+        if None in new_element.get_measured_size():
+            # not measured yet (created during a batch)
+            self._cells_sizes_outdated = True
+            self.ask_layout_update()
+        elif self._set_cell_size(new_element, new_element.get_measured_size()):
+            # the sizes of the table and of the other cells change
+            self.ask_layout_update()
+        else:
+            self._update_displayed_elements()
         return new_element
     
     def remove_element(self, x: int, y: int) -> bool:
         index = x + y * self.nb_elements_width
-        if index < 0 or index > len(self._elements): return False
+        if index < 0 or index >= len(self._elements): return False
         element = self._elements[index]
         if element is None: return False
         for class_name in self.cells_classes_names:
@@ -98,15 +266,58 @@ class Table(UIElement):
                 pass
         element.parent = None
         self._elements[index] = None
+        sizes_changed = self._set_cell_size(element, None)
+        del self._elements_positions[element]
+        if element in self._displayed_elements:
+            self._displayed_elements.remove(element)
         if self.child_selected == element:
             self.child_selected = None
         element.delete()
-        self.update_element()
-        self._ui_manager.ask_refresh()
+        if sizes_changed:
+            self.ask_layout_update()
+        else:
+            self._update_displayed_elements()
+        self._ui_manager.ask_refresh(self)
         return True
 
+    def _set_cell_size(self, element: Button, size: tuple[int, int]|None) -> bool:
+        """
+        Store the measured size of the cell (None if it is removed) and update the sizes of its column and row,
+        in O(log n), or in O(n) if it was the biggest cell of its column or row and it shrunk.
+        Returns True if the size of the column or of the row changed.
+        """
+        x, y = self._elements_positions[element]
+        previous_width, previous_height = self._cells_sizes.pop(element, (0, 0))
+        if size is not None:
+            self._cells_sizes[element] = size
+        width, height = (0, 0) if size is None else size
+        column_width = max(self._columns_widths[x], width)
+        if width < previous_width == self._columns_widths[x]:
+            column_width = self._get_biggest_cell_size(range(x, len(self._elements), self.nb_elements_width), 0, self.elements_width)
+        row_height = max(self._rows_heights[y], height)
+        if height < previous_height == self._rows_heights[y]:
+            start = y * self.nb_elements_width
+            row_height = self._get_biggest_cell_size(range(start, start + self.nb_elements_width), 1, self.elements_height)
+        changed = False
+        if column_width != self._columns_widths[x]:
+            self._columns_widths.set(x, column_width)
+            changed = True
+        if row_height != self._rows_heights[y]:
+            self._rows_heights.set(y, row_height)
+            changed = True
+        return changed
+
+    def _get_biggest_cell_size(self, indexes: range, dimension: int, default_size: int|None) -> int:
+        """Returns the biggest width (dimension 0) or height (dimension 1) of the cells at the indexes"""
+        size = default_size if default_size is not None else 0
+        for index in indexes:
+            element = self._elements[index]
+            if element is not None and element in self._cells_sizes:
+                size = max(size, self._cells_sizes[element][dimension])
+        return size
+
     def get_element_by_index(self, index: int) -> Button|None:
-        if index < 0 or index > len(self._elements): return None
+        if index < 0 or index >= len(self._elements): return None
         return self._elements[index]
     
     def get_element(self, x: int, y: int) -> Button|None:
@@ -116,10 +327,46 @@ class Table(UIElement):
         """
         Returns a $1|None(x, y) of the pos of the given element if in the table else (-1, -1)
         """
-        for index, e in enumerate(self._elements):
-            if e == element:
-                return index % self.nb_elements_width, index // self.nb_elements_width
-        return -1, -1
+        return self._elements_positions.get(element, (-1, -1))
+
+    def get_pos_at(self, x: int, y: int) -> tuple[int, int]:
+        """
+        Returns the (x, y) pos of the cell displayed at the given window coords,
+        or (-1, -1) if the coords are not in a cell of the table
+        """
+        if not self.is_in_element(x, y):
+            return -1, -1
+        column = self._columns_widths.find(x - self._start_coords[0] + self._SIZE_SCROLL_SHIFT * self.scroll_shift[0])
+        row = self._rows_heights.find(y - self._start_coords[1] + self._SIZE_SCROLL_SHIFT * self.scroll_shift[1])
+        if column >= self.nb_elements_width or row >= self.nb_elements_height:
+            return -1, -1
+        return column, row
+
+    def get_element_at(self, x: int, y: int) -> Button|None:
+        """Returns the cell displayed at the given window coords, if any"""
+        column, row = self.get_pos_at(x, y)
+        if column == -1:
+            return None
+        return self.get_element(column, row)
+
+    def scroll_to_pos(self, x: int, y: int) -> None:
+        """Scroll the table the least possible to display the cell at the given pos"""
+        shift_x = self._get_scroll_shift_to_display(self._columns_widths, x, self.scroll_shift[0], self._size[0])
+        shift_y = self._get_scroll_shift_to_display(self._rows_heights, y, self.scroll_shift[1], self._size[1])
+        if (shift_x, shift_y) == self.scroll_shift: return
+        self.scroll_shift = shift_x, shift_y
+        self._update_displayed_elements()
+        self._ui_manager.ask_refresh(self)
+        self._ui_manager.ask_hover_update()
+
+    def _get_scroll_shift_to_display(self, sizes: FenwickTree, index: int, scroll_shift: int, size: int) -> int:
+        start = sizes.prefix_sum(index)
+        end = start + sizes[index]
+        if start < scroll_shift * self._SIZE_SCROLL_SHIFT:
+            return start // self._SIZE_SCROLL_SHIFT
+        if end > scroll_shift * self._SIZE_SCROLL_SHIFT + size:
+            return -((size - end) // self._SIZE_SCROLL_SHIFT)
+        return scroll_shift
 
     def set_selected_child(self, element: UIElement) -> None:
         if self.child_selected is not None:
@@ -132,62 +379,171 @@ class Table(UIElement):
     def get_selected_element(self) -> UIElement|None:
         return self.child_selected
 
+    def get_children(self) -> list[Button]:
+        return self._displayed_elements
+
     def get_content_size(self) -> tuple[int, int]:
-        width = sum(self.max_elements_widths)
-        height = sum(self.max_elements_heights)
+        width = self._columns_widths.get_total()
+        height = self._rows_heights.get_total()
         if not self._relative_width:
             width = min(self._size[0], width)
         if not self._relative_height:
             height = min(self._size[1], height)
         return width, height
 
-    def update_element(self) -> None:
-        self.max_elements_widths = [self.elements_width if self.elements_width is not None else 0 for _ in self.max_elements_widths]
-        self.max_elements_heights = [self.elements_height if self.elements_height is not None else 0 for _ in self.max_elements_heights]
-        for index, element in enumerate(self._elements):
-            if element is None: continue
-            x = index % self.nb_elements_width
-            y = index // self.nb_elements_width
-            self.max_elements_widths[x] = max(self.max_elements_widths[x], element._size[0])
-            self.max_elements_heights[y] = max(self.max_elements_heights[y], element._size[1])
-        super().update_element()
-        for index, element in enumerate(self._elements):
+    def measure_tree(self) -> None:
+        """If the cells sizes are outdated (like after a theme change), all the cells are measured, else only the displayed ones"""
+        if self._cells_sizes_outdated:
+            for element in self._elements_positions:
+                element.measure_tree()
+            self.measure()
+        else:
+            super().measure_tree()
+
+    def measure(self) -> None:
+        """
+        The sizes of the columns and rows are the biggest sizes of their cells.
+        They are computed again from all the cells if the cells sizes are outdated,
+        else they are only updated with the sizes of the displayed cells who changed (see _set_cell_size).
+        """
+        if self._cells_sizes_outdated:
+            self._cells_sizes_outdated = False
+            max_elements_widths = [self.elements_width if self.elements_width is not None else 0] * self.nb_elements_width
+            max_elements_heights = [self.elements_height if self.elements_height is not None else 0] * self.nb_elements_height
+            self._cells_sizes = {}
+            for element, (x, y) in self._elements_positions.items():
+                width, height = self._cells_sizes[element] = element.get_measured_size()
+                max_elements_widths[x] = max(max_elements_widths[x], width)
+                max_elements_heights[y] = max(max_elements_heights[y], height)
+            self._columns_widths = FenwickTree(max_elements_widths)
+            self._rows_heights = FenwickTree(max_elements_heights)
+        else:
+            for element in self._displayed_elements:
+                self.update_child_size(element)
+        super().measure()
+
+    def update_child_size(self, child: UIElement) -> None:
+        if child not in self._elements_positions or self._cells_sizes_outdated: return
+        size = child.get_measured_size()
+        if size != self._cells_sizes.get(child):
+            self._set_cell_size(child, size)
+
+    def arrange(self) -> None:
+        super().arrange()
+        self._update_displayed_elements()
+
+    def _get_displayed_range(self, sizes: FenwickTree, scroll: int, size: int) -> range:
+        """Returns the indexes of the columns or rows who are in the table with the given scroll"""
+        return range(sizes.find(scroll), min(sizes.find(scroll + size - 1) + 1, len(sizes)))
+
+    def _get_displayed_cells_coords(self) -> Iterator[tuple[int, int, int, int]]:
+        """Yields the (x, y) pos of the cells in the table with the actual scroll, and their coords relative to the table"""
+        scroll_x = self._SIZE_SCROLL_SHIFT * self.scroll_shift[0]
+        scroll_y = self._SIZE_SCROLL_SHIFT * self.scroll_shift[1]
+        columns = self._get_displayed_range(self._columns_widths, scroll_x, self._size[0])
+        rows = self._get_displayed_range(self._rows_heights, scroll_y, self._size[1])
+        columns_starts = list(accumulate((self._columns_widths[x] for x in columns), initial=self._columns_widths.prefix_sum(columns.start)))
+        cell_y = self._rows_heights.prefix_sum(rows.start)
+        for y in rows:
+            for x, cell_x in zip(columns, columns_starts):
+                yield x, y, cell_x - scroll_x, cell_y - scroll_y
+            cell_y += self._rows_heights[y]
+
+    def _update_displayed_elements(self) -> None:
+        """
+        Set the coords and the size of the cells in the table from the columns and rows sizes and the scroll, and arrange them.
+        The cells who were already displayed were measured with the table (see get_children), so they are only arranged,
+        and the cells coming in the table are measured first.
+        The cells who are not in the table anymore are put out of it once, so they have an empty fit_in_parent_rect,
+        then they are skipped until they are in the table again.
+        """
+        previous_displayed_elements = self._displayed_elements
+        if not self._elements_positions and not previous_displayed_elements: return
+        previous_elements = set(previous_displayed_elements)
+        self._displayed_elements = []
+        for x, y, element_x, element_y in self._get_displayed_cells_coords():
+            element = self._elements[x + y * self.nb_elements_width]
             if element is None: continue
-            x, y = index % self.nb_elements_width, index // self.nb_elements_width
-            element._first_coords = (sum(self.max_elements_widths[:x]) - self._SIZE_SCROLL_SHIFT * self.scroll_shift[0], sum(self.max_elements_heights[:y]) - self._SIZE_SCROLL_SHIFT * self.scroll_shift[1])
-            element._first_size = self.max_elements_widths[x], self.max_elements_heights[y]
-            element.update_element()
+            element._first_coords = (element_x, element_y)
+            element._first_size = self._columns_widths[x], self._rows_heights[y]
+            if element not in previous_elements:
+                element.measure_tree()
+            element.arrange()
+            self._displayed_elements.append(element)
+        kept_elements = set(self._displayed_elements)
+        for element in previous_displayed_elements:
+            if element in kept_elements or element.parent is not self: continue
+            element._first_coords = (-element._size[0], -element._size[1])
+            element.arrange()
     
     def scroll_elements(self) -> None:
         y = self.wheel_move[1]
         if y >= 0:
             y = min(y, self.scroll_shift[1])
         elif y < 0:
-            if self._size[1] >= sum(self.max_elements_heights) - self.scroll_shift[1] * self._SIZE_SCROLL_SHIFT:
+            if self._size[1] >= self._rows_heights.get_total() - self.scroll_shift[1] * self._SIZE_SCROLL_SHIFT:
                 y = 0
         x = self.wheel_move[0]
         if x >= 0:
             x = min(x, self.scroll_shift[0])
         elif x < 0:
-            if self._size[0] >= sum(self.max_elements_widths) - self.scroll_shift[0] * self._SIZE_SCROLL_SHIFT:
+            if self._size[0] >= self._columns_widths.get_total() - self.scroll_shift[0] * self._SIZE_SCROLL_SHIFT:
                 x = 0
         if x == 0 and y == 0: return
         self.scroll_shift = self.scroll_shift[0] - x, self.scroll_shift[1] - y
-        for element in self._elements:
-            if element is None: continue
-        self.update_element()
-        self._ui_manager.ask_refresh()
+        # the size and the coords of the table don't change, so only the displayed cells are updated
+        self._update_displayed_elements()
+        self._ui_manager.ask_refresh(self)
+        self._ui_manager.ask_hover_update()
 
     def update(self) -> None:
         if self.wheel_move[0] != 0 or self.wheel_move[1] != 0:
             self.scroll_elements()
+        if self._cell_renderer is not None:
+            self._update_cells_interactions()
+        if self._data_model is not None and self._data_model.update():
+            self._ui_manager.ask_update(self)
         super().update()
 
+    def _update_cells_interactions(self) -> None:
+        """In render-only mode, select the hovered cell when the table is unclicked"""
+        if self._unclicked and self._hovered_pos is not None and self.get_cell_value(*self._hovered_pos) is not None:
+            self._selected_pos = self._hovered_pos
+            self._ui_manager.ask_refresh(self)
+            if self.on_select_function is not None:
+                self.on_select_function(self._hovered_pos)
+
+    def _set_hovered_cell(self, hovered_pos: tuple[int, int]|None) -> None:
+        if hovered_pos == self._hovered_pos: return
+        self._hovered_pos = hovered_pos
+        self._ui_manager.ask_refresh(self)
+
+    def set_hovered(self, hovered: bool) -> None:
+        super().set_hovered(hovered)
+        if not hovered and self._cell_renderer is not None:
+            self._set_hovered_cell(None)
+
+    def set_hovered_pos(self, x: int, y: int) -> None:
+        """In render-only mode, find the hovered cell with the table geometry"""
+        if self._cell_renderer is None: return
+        pos = self.get_pos_at(x, y)
+        self._set_hovered_cell(None if pos == (-1, -1) else pos)
+
     def _display(self) -> None:
         super()._display()
-        for element in self._elements:
-            if element is None: continue
-            element._display()
+        for element in self._displayed_elements:
+            element.display_clipped()
+        if self._cell_renderer is not None:
+            self._display_cells()
+
+    def _display_cells(self) -> None:
+        window = self._ui_manager.get_window()
+        start_x, start_y = self._start_coords
+        for x, y, cell_x, cell_y in self._get_displayed_cells_coords():
+            value = self.get_cell_value(x, y)
+            if value is None: continue
+            rect = pygame.Rect(start_x + cell_x, start_y + cell_y, self._columns_widths[x], self._rows_heights[y])
+            self._cell_renderer(window, rect, value, (x, y) == self._hovered_pos, (x, y) == self._selected_pos)
     
     def set_visibility(self, visible: bool) -> None:
         super().set_visibility(visible)
@@ -206,11 +562,17 @@ class Table(UIElement):
         table_copy._elements = [copy(element) for element in self._elements]
         for element in table_copy._elements:
             element.parent = table_copy
+        table_copy._elements_positions = {element: (index % self.nb_elements_width, index // self.nb_elements_width) for index, element in enumerate(table_copy._elements) if element is not None}
         table_copy.update_element()
         return table_copy
     
     def delete(self) -> None:
         for element in self._elements:
+            if element is None: continue
             element.delete()
         self._elements.clear()
+        if self._data_model is not None:
+            self._data_model.remove_on_change_function(self._on_data_model_change)
+            self._data_model = None
+        self._release_cells_font()
         super().delete()
\ No newline at end of file
@@ -0,0 +1,141 @@
+from typing import Any, Callable, Sequence
+from array import array
+from table_data_model_interface import TableDataModelInterface
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class TableDataModel(TableDataModelInterface):
+    """
+    The values of a table, stored by columns.
+    The rows are displayed in the order of an index permutation, so sorting and filtering
+    only compute a new permutation, without moving the values nor creating any element.
+    If NumPy is installed, the columns are NumPy arrays and the permutations are computed with vectorized operations,
+    else the columns are lists (or the given arrays) and the permutations are computed with the built-in sort.
+    The texts of the cells are only formatted when they are asked, so only for the displayed cells.
+    """
+    def __init__(self, columns: dict[str, Sequence[Any]], formatters: dict[str, Callable[[Any], str]]|None=None) -> None:
+        self._columns_names = list(columns)
+        self._columns = [self._to_column(values) for values in columns.values()]
+        self._nb_rows = len(self._columns[0]) if self._columns else 0
+        if any(len(column) != self._nb_rows for column in self._columns):
+            raise ValueError("All the columns must have the same length")
+        formatters = {} if formatters is None else formatters
+        self._formatters: list[Callable[[Any], str]] = [formatters.get(name, str) for name in self._columns_names]
+        self._order = numpy.arange(self._nb_rows) if numpy is not None else list(range(self._nb_rows))
+        self._sort_column: int|None = None
+        self._sort_reverse = False
+        self._filters: dict[int, Callable[[Sequence[Any]], Sequence[bool]]] = {}
+        self._on_change_functions: list[Callable[[], None]] = []
+
+    @staticmethod
+    def _to_column(values: Sequence[Any]) -> Sequence[Any]:
+        if numpy is not None:
+            return numpy.asarray(values)
+        if isinstance(values, array):
+            return values
+        return list(values)
+
+    def _get_column_index(self, column: int|str) -> int:
+        if isinstance(column, str):
+            return self._columns_names.index(column)
+        return column
+
+    def add_on_change_function(self, function: Callable[[], None]) -> None:
+        """The function is called each time the displayed rows change"""
+        self._on_change_functions.append(function)
+
+    def remove_on_change_function(self, function: Callable[[], None]) -> None:
+        if function in self._on_change_functions:
+            self._on_change_functions.remove(function)
+
+    def _changed(self) -> None:
+        for function in self._on_change_functions:
+            function()
+
+    def get_columns_names(self) -> list[str]:
+        return self._columns_names
+
+    def get_columns_number(self) -> int:
+        return len(self._columns)
+
+    def get_rows_number(self) -> int:
+        """Returns the number of displayed rows, so the number of rows who are not filtered"""
+        return len(self._order)
+
+    def get_column(self, column: int|str) -> Sequence[Any]:
+        """Returns all the values of the column, in the original order"""
+        return self._columns[self._get_column_index(column)]
+
+    def get_row_index(self, y: int) -> int:
+        """Returns the index in the columns of the row displayed at the given pos"""
+        return int(self._order[y])
+
+    def get_value(self, x: int, y: int) -> Any:
+        return self._columns[x][self._order[y]]
+
+    def get_text(self, x: int, y: int) -> str:
+        return self._formatters[x](self._columns[x][self._order[y]])
+
+    def update(self) -> bool:
+        return False
+
+    def set_formatter(self, column: int|str, formatter: Callable[[Any], str]) -> None:
+        self._formatters[self._get_column_index(column)] = formatter
+        self._changed()
+
+    def sort(self, column: int|str|None, reverse: bool = False) -> None:
+        """Sort the rows by the values of the column (stable), or put them back in their original order if column is None"""
+        self._sort_column = None if column is None else self._get_column_index(column)
+        self._sort_reverse = reverse
+        if self._sort_column is None:
+            self._apply_filters()
+        else:
+            self._apply_sort()
+        self._changed()
+
+    def _apply_sort(self) -> None:
+        if self._sort_column is None: return
+        column = self._columns[self._sort_column]
+        if numpy is not None:
+            # a stable sort of the reversed order keeps the original order of the equal values once reversed again
+            order = self._order[::-1] if self._sort_reverse else self._order
+            order = order[numpy.argsort(column[order], kind='stable')]
+            self._order = order[::-1] if self._sort_reverse else order
+        else:
+            self._order.sort(key=column.__getitem__, reverse=self._sort_reverse)
+
+    def set_filter(self, column: int|str, predicate: Callable[[Sequence[Any]], Sequence[bool]]|None) -> None:
+        """
+        Only display the rows where the predicate is true.
+        The predicate is given the whole column, and returns a boolean for each value
+        (with NumPy, the column is an array, so it can be vectorized, like 'lambda values: values > 0').
+        If predicate is None, removes the filter of the column.
+        """
+        column = self._get_column_index(column)
+        if predicate is None:
+            self._filters.pop(column, None)
+        else:
+            self._filters[column] = predicate
+        self._apply_filters()
+        self._changed()
+
+    def clear_filters(self) -> None:
+        self._filters.clear()
+        self._apply_filters()
+        self._changed()
+
+    def _apply_filters(self) -> None:
+        """Compute the order again from the filters, then sort it"""
+        if numpy is not None:
+            mask = numpy.ones(self._nb_rows, dtype=bool)
+            for column, predicate in self._filters.items():
+                mask &= numpy.asarray(predicate(self._columns[column]), dtype=bool)
+            self._order = numpy.flatnonzero(mask)
+        else:
+            mask = [True] * self._nb_rows
+            for column, predicate in self._filters.items():
+                mask = [kept and value_kept for kept, value_kept in zip(mask, predicate(self._columns[column]))]
+            self._order = [row for row, kept in enumerate(mask) if kept]
+        self._apply_sort()
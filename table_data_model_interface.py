@@ -0,0 +1,31 @@
+from abc import abstractmethod, ABCMeta
+from typing import Callable
+
+class TableDataModelInterface(metaclass=ABCMeta):
+    @abstractmethod
+    def add_on_change_function(self, function: Callable[[], None]) -> None:
+        """The function is called each time the displayed rows change"""
+
+    @abstractmethod
+    def remove_on_change_function(self, function: Callable[[], None]) -> None:
+        pass
+
+    @abstractmethod
+    def get_columns_names(self) -> list[str]:
+        pass
+
+    @abstractmethod
+    def get_columns_number(self) -> int:
+        pass
+
+    @abstractmethod
+    def get_rows_number(self) -> int:
+        pass
+
+    @abstractmethod
+    def get_text(self, x: int, y: int) -> str:
+        """Returns the text of the cell displayed at the given pos"""
+
+    @abstractmethod
+    def update(self) -> bool:
+        """Called once per frame by the table while it returns True, to do some work without blocking the frame"""
@@ -0,0 +1,41 @@
+import random
+from fenwick_tree import FenwickTree
+
+def test_prefix_sums():
+    values = [random.randint(0, 20) for _ in range(100)]
+    tree = FenwickTree(values)
+    assert len(tree) == 100
+    for index in range(101):
+        assert tree.prefix_sum(index) == sum(values[:index])
+    assert tree.get_total() == sum(values)
+
+def test_set():
+    values = [3] * 50
+    tree = FenwickTree(values)
+    for _ in range(200):
+        index, value = random.randrange(50), random.randint(0, 10)
+        tree.set(index, value)
+        values[index] = value
+    assert tree.get_values() == values
+    assert [tree.prefix_sum(index) for index in range(51)] == [sum(values[:index]) for index in range(51)]
+
+def test_extend():
+    tree = FenwickTree([1, 2, 3])
+    values = [1, 2, 3]
+    for size in (1, 5, 0, 13, 64):
+        new_values = [random.randint(0, 9) for _ in range(size)]
+        tree.extend(new_values)
+        values.extend(new_values)
+        assert [tree.prefix_sum(index) for index in range(len(values) + 1)] == [sum(values[:index]) for index in range(len(values) + 1)]
+    assert FenwickTree().get_total() == 0
+
+def test_find():
+    tree = FenwickTree([10, 0, 5, 20])
+    assert tree.find(-1) == 0
+    assert tree.find(0) == 0
+    assert tree.find(9) == 0
+    assert tree.find(10) == 2 # the empty value is skipped
+    assert tree.find(14) == 2
+    assert tree.find(15) == 3
+    assert tree.find(34) == 3
+    assert tree.find(35) == 4
@@ -0,0 +1,64 @@
+import random
+import pytest
+from indexed_list import IndexedList
+
+@pytest.fixture(autouse=True)
+def small_blocks(monkeypatch):
+    # small blocks so the blocks are split and removed
+    monkeypatch.setattr(IndexedList, '_BLOCK_SIZE', 4)
+
+def test_operations_match_a_list():
+    values = IndexedList()
+    expected = []
+    for step in range(2000):
+        operation = random.random()
+        if operation < 0.5 or not expected:
+            index = random.randint(-len(expected) - 1, len(expected) + 1)
+            values.insert(index, step)
+            expected.insert(index, step)
+        elif operation < 0.8:
+            index = random.randrange(len(expected))
+            assert values.pop(index) == expected.pop(index)
+        else:
+            from_index, to_index = random.randrange(len(expected)), random.randrange(len(expected))
+            values.move(from_index, to_index)
+            expected.insert(to_index, expected.pop(from_index))
+        assert len(values) == len(expected)
+    assert list(values) == expected
+    assert [values[index] for index in range(len(expected))] == expected
+    assert values[3:17] == expected[3:17]
+
+def test_unique_index():
+    values = IndexedList(range(100), unique=True)
+    values.remove(10)
+    values.insert(0, 'first')
+    assert values.index('first') == 0
+    assert values.index(50) == 50
+    assert 10 not in values and 'first' in values
+    with pytest.raises(ValueError):
+        values.index(10)
+
+def test_out_of_range():
+    values = IndexedList([1, 2, 3])
+    with pytest.raises(IndexError):
+        values[3]
+    with pytest.raises(IndexError):
+        values.pop(-4)
+
+def test_extend_and_clear():
+    values = IndexedList([0, 1])
+    values.extend(range(2, 30))
+    assert list(values) == list(range(30))
+    values.clear()
+    assert len(values) == 0 and list(values) == []
+
+def test_insert_sorted():
+    values = IndexedList()
+    expected = []
+    for _ in range(200):
+        value = random.randint(0, 50)
+        index = values.insert_sorted(value)
+        expected.append(value)
+        expected.sort()
+        assert values[index] == value
+    assert list(values) == expected
@@ -0,0 +1,60 @@
+import pygame
+import pytest
+from ui_manager import UIManager
+from container import Container
+from label import Label
+
+@pytest.fixture
+def ui_manager():
+    # pygame is not quit after the tests, since the fonts are shared by all the managers (see FontCache)
+    pygame.init()
+    return UIManager(pygame.display.set_mode((800, 600)))
+
+def build(ui_manager: UIManager, text: str, other_text: str) -> tuple[Container, Container, Label, Label]:
+    """A container sized by its content, in another one, with a label filling its width and another label"""
+    outer = Container(ui_manager, 10, 10)
+    inner = Container(ui_manager, parent=outer)
+    outer.add_element(inner)
+    filling = Label(ui_manager, text, parent=inner)
+    filling.fill_parent_width = True
+    inner.add_element(filling)
+    other = Label(ui_manager, other_text, y=30, parent=inner)
+    inner.add_element(other)
+    ui_manager.update()
+    return outer, inner, filling, other
+
+def get_sizes(elements) -> list[tuple[int, int]]:
+    return [element.get_size() for element in elements]
+
+def test_layout_is_deferred_to_the_update(ui_manager):
+    outer, inner, filling, other = build(ui_manager, 'a', 'a medium text')
+    sizes = get_sizes((outer, inner, filling, other))
+    other.set_text('a much longer text than before')
+    assert get_sizes((outer, inner, filling, other)) == sizes
+    ui_manager.update()
+    expected = build(UIManager(ui_manager.window), 'a', 'a much longer text than before')
+    assert get_sizes((outer, inner, filling, other)) == get_sizes(expected)
+    assert outer.get_size()[0] > sizes[0][0]
+
+def test_size_changes_propagate_to_the_parents(ui_manager):
+    outer, inner, filling, other = build(ui_manager, 'a', 'a medium text')
+    filling.set_text('a text longer than the other label')
+    ui_manager.update_layout()
+    expected = build(UIManager(ui_manager.window), 'a text longer than the other label', 'a medium text')
+    assert get_sizes((outer, inner, filling, other)) == get_sizes(expected)
+    # the label filling its parent keeps the width of its parent when its text is shorter again
+    filling.set_text('b')
+    ui_manager.update_layout()
+    expected = build(UIManager(ui_manager.window), 'b', 'a medium text')
+    assert get_sizes((outer, inner, filling, other)) == get_sizes(expected)
+    assert filling.get_size()[0] == inner.get_size()[0]
+
+def test_unchanged_sizes_stop_the_propagation(ui_manager):
+    outer = Container(ui_manager, 10, 10, 300, 200)
+    label = Label(ui_manager, 'text', parent=outer)
+    outer.add_element(label)
+    ui_manager.update()
+    label.set_text('another text')
+    ui_manager.update_layout()
+    assert outer.get_size() == (300, 200)
+    assert label.get_size() == Label(ui_manager, 'another text').get_size()
@@ -0,0 +1,58 @@
+import asyncio
+import time
+import pytest
+from paged_data_source import PagedDataSource
+
+def wait_page(source: PagedDataSource) -> list[str]|None:
+    for _ in range(500):
+        page = source.get_page()
+        if page is not None:
+            return page
+        time.sleep(0.01)
+    raise TimeoutError
+
+def test_pages():
+    source = PagedDataSource(range(25), page_size=10)
+    pages = []
+    while not source.is_exhausted():
+        source.request_page()
+        pages.append(wait_page(source))
+    assert pages == [[str(i) for i in range(10)], [str(i) for i in range(10, 20)], [str(i) for i in range(20, 25)]]
+    source.close()
+
+def test_error_is_raised_by_get_page():
+    def texts():
+        yield 'a'
+        raise OSError('lost')
+    source = PagedDataSource(texts(), page_size=10)
+    source.request_page()
+    with pytest.raises(OSError):
+        wait_page(source)
+    source.close()
+
+def test_async_source_is_closed():
+    closed = []
+    async def texts():
+        try:
+            for index in range(1000):
+                await asyncio.sleep(0.001)
+                yield str(index)
+        finally:
+            closed.append(True)
+    source = PagedDataSource(texts(), page_size=5)
+    source.request_page()
+    assert wait_page(source) == ['0', '1', '2', '3', '4']
+    source.request_page()
+    source.close()
+    assert closed == [True]
+    assert source._loop.is_closed()
+
+def test_blocking_source_does_not_block_close():
+    def texts():
+        yield 'a'
+        time.sleep(3600)
+    source = PagedDataSource(texts(), page_size=2)
+    source.request_page()
+    time.sleep(0.01)
+    source.close() # the page thread is a daemon, so it doesn't keep the program running
+    assert source.is_exhausted() and not source.is_loading()
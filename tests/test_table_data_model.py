@@ -0,0 +1,48 @@
+from table_data_model import TableDataModel
+import pytest
+
+def make_model() -> TableDataModel:
+    return TableDataModel({'name': ['c', 'a', 'b', 'a'], 'value': [3, 1, 2, 4]}, formatters={'value': lambda value: f'{value:.1f}'})
+
+def get_rows(model: TableDataModel) -> list[list[str]]:
+    return [[model.get_text(x, y) for x in range(model.get_columns_number())] for y in range(model.get_rows_number())]
+
+def test_texts():
+    model = make_model()
+    assert model.get_columns_names() == ['name', 'value']
+    assert get_rows(model)[0] == ['c', '3.0']
+
+def test_sort_is_stable():
+    model = make_model()
+    model.sort('name')
+    assert get_rows(model) == [['a', '1.0'], ['a', '4.0'], ['b', '2.0'], ['c', '3.0']]
+    model.sort('name', reverse=True)
+    assert get_rows(model) == [['c', '3.0'], ['b', '2.0'], ['a', '1.0'], ['a', '4.0']]
+    model.sort(None)
+    assert [model.get_row_index(y) for y in range(4)] == [0, 1, 2, 3]
+
+def test_filters_keep_the_sort():
+    model = make_model()
+    model.sort('value', reverse=True)
+    model.set_filter('value', lambda values: [value > 1 for value in values])
+    assert get_rows(model) == [['a', '4.0'], ['c', '3.0'], ['b', '2.0']]
+    model.set_filter('name', lambda values: [value != 'c' for value in values])
+    assert get_rows(model) == [['a', '4.0'], ['b', '2.0']]
+    model.set_filter('name', None)
+    assert model.get_rows_number() == 3
+    model.clear_filters()
+    assert model.get_rows_number() == 4
+
+def test_change_functions():
+    model = make_model()
+    calls = []
+    function = lambda: calls.append(model.get_rows_number())
+    model.add_on_change_function(function)
+    model.set_filter('value', lambda values: [value < 3 for value in values])
+    model.remove_on_change_function(function)
+    model.clear_filters()
+    assert calls == [2]
+
+def test_columns_lengths():
+    with pytest.raises(ValueError):
+        TableDataModel({'a': [1, 2], 'b': [1]})
@@ -0,0 +1,61 @@
+import random
+from text_buffer import TextBuffer
+
+class FixedWidthFont:
+    """A font whose characters widths are their code points, so the widths are known without pygame"""
+    def size(self, text: str) -> tuple[int, int]:
+        return sum(map(ord, text)), 10
+
+def test_edits_at_the_caret():
+    buffer = TextBuffer('hello world')
+    buffer.move_caret(5)
+    buffer.insert(',')
+    buffer.delete_after(1)
+    buffer.insert(' ')
+    buffer.move_caret(0)
+    buffer.insert('>')
+    buffer.move_caret(len(buffer))
+    buffer.delete_before(2)
+    assert buffer.get_text() == '>hello, wor'
+    assert buffer.get_caret() == len(buffer)
+    assert buffer.get_slice(1, 6) == 'hello'
+
+def test_random_edits_match_a_string():
+    buffer = TextBuffer('abc', FixedWidthFont())
+    text, caret = 'abc', 3
+    for _ in range(1000):
+        operation = random.random()
+        if operation < 0.3:
+            caret = random.randint(0, len(text))
+            buffer.move_caret(caret)
+        elif operation < 0.6:
+            inserted = ''.join(random.choice('xyz é') for _ in range(random.randint(1, 3)))
+            buffer.insert(inserted)
+            text = text[:caret] + inserted + text[caret:]
+            caret += len(inserted)
+        elif operation < 0.8:
+            nb_chars = min(random.randint(1, 3), caret)
+            buffer.delete_before(nb_chars)
+            text = text[:caret - nb_chars] + text[caret:]
+            caret -= nb_chars
+        else:
+            nb_chars = random.randint(1, 3)
+            buffer.delete_after(nb_chars)
+            text = text[:caret] + text[caret + nb_chars:]
+        assert buffer.get_text() == text
+        assert buffer.get_caret() == caret
+    start, end = sorted(random.choices(range(len(text) + 1), k=2)) # the text can be empty after the deletions
+    assert buffer.get_slice(start, end) == text[start:end]
+    assert buffer.get_width(start, end) == sum(map(ord, text[start:end]))
+
+def test_index_at_width():
+    buffer = TextBuffer('abcdef', FixedWidthFont())
+    buffer.move_caret(3)
+    for index in range(7):
+        width = buffer.get_prefix_width(index)
+        assert width == sum(map(ord, 'abcdef'[:index]))
+        assert buffer.get_index_at_width(width) == index
+        if index:
+            assert buffer.get_index_at_width(width - 1) == index - 1
+    assert buffer.get_index_at_width(-5) == 0
+    assert buffer.get_index_at_width(10**6) == 6
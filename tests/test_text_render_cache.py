@@ -0,0 +1,31 @@
+import pygame
+import pytest
+from text_render_cache import TextRenderCache
+
+@pytest.fixture
+def text_font():
+    pygame.font.init()
+    TextRenderCache.clear()
+    yield pygame.font.Font(None, 20)
+    TextRenderCache.clear()
+
+def test_shared_surfaces(text_font):
+    surface = TextRenderCache.render(text_font, 'text', True, (0, 0, 0))
+    assert TextRenderCache.render(text_font, 'text', True, 'black') is surface
+    assert TextRenderCache.render(text_font, 'text', False, (0, 0, 0)) is not surface
+    assert TextRenderCache.render(text_font, 'text', True, (0, 0, 0), 128) is not surface
+    assert TextRenderCache.get_stats() == {'hits': 1, 'misses': 3, 'evictions': 0, 'size': 3}
+
+def test_least_recently_used_eviction(text_font, monkeypatch):
+    monkeypatch.setattr(TextRenderCache, 'max_size', 3)
+    first = TextRenderCache.render(text_font, 'a', True, (0, 0, 0))
+    TextRenderCache.render(text_font, 'b', True, (0, 0, 0))
+    TextRenderCache.render(text_font, 'c', True, (0, 0, 0))
+    assert TextRenderCache.render(text_font, 'a', True, (0, 0, 0)) is first # 'a' is now the most recently used
+    TextRenderCache.render(text_font, 'd', True, (0, 0, 0)) # evicts 'b'
+    stats = TextRenderCache.get_stats()
+    assert stats['evictions'] == 1 and stats['size'] == 3
+    assert TextRenderCache.render(text_font, 'a', True, (0, 0, 0)) is first
+    misses = TextRenderCache.get_stats()['misses']
+    TextRenderCache.render(text_font, 'b', True, (0, 0, 0))
+    assert TextRenderCache.get_stats()['misses'] == misses + 1
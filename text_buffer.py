@@ -0,0 +1,145 @@
+from pygame import font
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate, islice
+
+class TextBuffer:
+    """
+    An editable text, stored as a gap buffer where the gap is at the caret:
+    the characters before the caret are stored in order, the ones after it are stored in reverse order,
+    so inserting or removing at the caret is amortised O(1), and moving the caret by n characters is O(n).
+
+    The widths of the text are stored for each side of the gap
+    (from the start of the text for the characters before the caret, from the end of the text for the ones after it),
+    so the width of any part of the text is computed in O(1), and finding the character at a given width in O(log n).
+    The width of a text is the sum of the widths of its characters.
+    """
+    def __init__(self, text: str='', text_font: font.Font|None=None) -> None:
+        self._font = text_font
+        self._chars_widths: dict[str, int] = {}
+        self._before: list[str] = []
+        self._after: list[str] = [] # reversed
+        self._before_widths = array('q', [0]) # _before_widths[i] is the width of the i first characters
+        self._after_widths = array('q', [0]) # _after_widths[i] is the width of the i last characters
+        self._text: str|None = None # cached result of get_text
+        self.set_text(text)
+
+    def __len__(self) -> int:
+        return len(self._before) + len(self._after)
+
+    def _get_char_width(self, char: str) -> int:
+        width = self._chars_widths.get(char)
+        if width is None:
+            width = 0 if self._font is None else self._font.size(char)[0]
+            self._chars_widths[char] = width
+        return width
+
+    def set_font(self, text_font: font.Font|None) -> None:
+        """Set the font used to compute the widths, and compute the widths of the whole text again"""
+        self._font = text_font
+        self._chars_widths.clear()
+        self.set_text(self.get_text(), self.get_caret())
+
+    def set_text(self, text: str, caret: int|None=None) -> None:
+        """Replace the text, and put the caret at the given position, or at the end of the text if not given"""
+        if caret is None:
+            caret = len(text)
+        caret = max(0, min(caret, len(text)))
+        self._before = list(text[:caret])
+        self._after = list(reversed(text[caret:]))
+        self._before_widths = array('q', [0])
+        self._after_widths = array('q', [0])
+        self._add_widths(self._before, self._before_widths)
+        self._add_widths(self._after, self._after_widths)
+        self._text = text
+
+    def _add_widths(self, chars: list[str]|str, widths: array) -> None:
+        for char in set(chars).difference(self._chars_widths):
+            self._get_char_width(char)
+        widths.extend(islice(accumulate(map(self._chars_widths.__getitem__, chars), initial=widths[-1]), 1, None))
+
+    def get_text(self) -> str:
+        if self._text is None:
+            self._text = ''.join(self._before) + ''.join(reversed(self._after))
+        return self._text
+
+    def get_slice(self, start: int, end: int) -> str:
+        """Returns the text between start and end, in O(end - start)"""
+        start = max(0, start)
+        end = min(len(self), end)
+        if start >= end:
+            return ''
+        caret = len(self._before)
+        text = ''
+        if start < caret:
+            text = ''.join(self._before[start:min(end, caret)])
+        if end > caret:
+            after_start = len(self) - end
+            after_end = len(self) - max(start, caret)
+            text += ''.join(reversed(self._after[after_start:after_end]))
+        return text
+
+    def get_caret(self) -> int:
+        return len(self._before)
+
+    def move_caret(self, caret: int) -> None:
+        caret = max(0, min(caret, len(self)))
+        if caret < len(self._before):
+            moved_chars = self._before[:caret - 1:-1] if caret else self._before[::-1]
+            del self._before[caret:]
+            del self._before_widths[caret + 1:]
+            self._after.extend(moved_chars)
+            self._add_widths(moved_chars, self._after_widths)
+        elif caret > len(self._before):
+            nb_after_chars = len(self) - caret
+            moved_chars = self._after[:nb_after_chars - 1:-1] if nb_after_chars else self._after[::-1]
+            del self._after[nb_after_chars:]
+            del self._after_widths[nb_after_chars + 1:]
+            self._before.extend(moved_chars)
+            self._add_widths(moved_chars, self._before_widths)
+
+    def insert(self, text: str) -> None:
+        """Insert the text at the caret, and put the caret after it"""
+        if not text: return
+        self._before.extend(text)
+        self._add_widths(text, self._before_widths)
+        self._text = None
+
+    def delete_before(self, nb_chars: int=1) -> None:
+        """Remove characters before the caret"""
+        nb_chars = min(nb_chars, len(self._before))
+        if nb_chars <= 0: return
+        del self._before[-nb_chars:]
+        del self._before_widths[-nb_chars:]
+        self._text = None
+
+    def delete_after(self, nb_chars: int=1) -> None:
+        """Remove characters after the caret"""
+        nb_chars = min(nb_chars, len(self._after))
+        if nb_chars <= 0: return
+        del self._after[-nb_chars:]
+        del self._after_widths[-nb_chars:]
+        self._text = None
+
+    def get_prefix_width(self, index: int) -> int:
+        """Returns the width of the 'index' first characters"""
+        index = max(0, min(index, len(self)))
+        if index <= len(self._before):
+            return self._before_widths[index]
+        return self._before_widths[-1] + self._after_widths[-1] - self._after_widths[len(self) - index]
+
+    def get_width(self, start: int=0, end: int|None=None) -> int:
+        """Returns the width of the text between start and end"""
+        if end is None:
+            end = len(self)
+        return max(0, self.get_prefix_width(end) - self.get_prefix_width(start))
+
+    def get_index_at_width(self, width: int) -> int:
+        """Returns the biggest index whose prefix width is smaller or equal to the given width (0 if there is none)"""
+        if width < 0:
+            return 0
+        if width < self._before_widths[-1]:
+            return bisect_right(self._before_widths, width) - 1
+        # after the caret, the prefix width of the index i is (whole width - width of the (len - i) last characters)
+        last_chars_width = self._before_widths[-1] + self._after_widths[-1] - width
+        return len(self) - bisect_left(self._after_widths, last_chars_width)
@@ -21,8 +21,7 @@ class TextButton(Button):
         self.label = Label(self._ui_manager, text, parent=self)
         self.label.fill_parent_width = True
         self.label.fill_parent_height = True
-        self.add_element(self.label)
-        self.update_element()
+        self.add_element(self.label) # the button is laid out with its label by the next layout pass (see Container.add_element)
     
     def get_text(self) -> str:
         return self.label.get_text()
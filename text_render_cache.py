@@ -0,0 +1,44 @@
+from pygame import font, Surface, Color
+from collections import OrderedDict
+from typing import Any
+
+class TextRenderCache:
+    """
+    Rendered texts shared by all the elements of the process.
+    When more than 'max_size' texts are stored, the least recently used ones are removed.
+    The returned surfaces are shared, so they must never be modified.
+    """
+    max_size: int = 1024
+    _surfaces: OrderedDict[tuple[font.Font, str, tuple[int, int, int, int], bool, int|None], Surface] = OrderedDict()
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @classmethod
+    def render(cls, text_font: font.Font, text: str, antialias: bool, color: Any, alpha: int|None=None) -> Surface:
+        key = (text_font, text, tuple(Color(color)), bool(antialias), alpha)
+        surface = cls._surfaces.get(key)
+        if surface is not None:
+            cls.hits += 1
+            cls._surfaces.move_to_end(key)
+            return surface
+        cls.misses += 1
+        surface = text_font.render(text, antialias, color)
+        if alpha is not None:
+            surface.set_alpha(alpha)
+        cls._surfaces[key] = surface
+        while len(cls._surfaces) > cls.max_size:
+            cls._surfaces.popitem(last=False)
+            cls.evictions += 1
+        return surface
+
+    @classmethod
+    def get_stats(cls) -> dict[str, int]:
+        return {'hits': cls.hits, 'misses': cls.misses, 'evictions': cls.evictions, 'size': len(cls._surfaces)}
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._surfaces.clear()
+        cls.hits = 0
+        cls.misses = 0
+        cls.evictions = 0
@@ -2,7 +2,8 @@ from ui_manager_interface import UIManagerInterface
 import pygame
 from ui_element_interface import UIElementInterface
 
-from typing import Any
+from typing import Any, Mapping
+from types import MappingProxyType
 
 class UIElement(UIElementInterface):
     def __init__(
@@ -40,7 +41,7 @@ class UIElement(UIElementInterface):
         if theme_elements_name is not None:
             self.theme_elements_name.extend(theme_elements_name)
         self.parent = parent
-        self._theme: dict[str, dict[str, Any]] = {}
+        self._theme: Mapping[str, Any] = MappingProxyType({})
         self._border_width: int = 0
         self._ui_manager: UIManagerInterface = ui_manager
         self._first_coords: tuple[int|str, int|str] = x, y
@@ -53,7 +54,13 @@ class UIElement(UIElementInterface):
         self._size = (width, height)
         self._relative_width = width is None
         self._relative_height = height is None
+        self._content_size: tuple[int, int]|None = None # cached result of get_content_size, see ask_layout_update
+        self._measured_size: tuple[int, int] = self._size # the size set by measure, before filling the parent
         self.fit_in_parent_rect: pygame.Rect = pygame.Rect(0, 0, 0, 0)
+        self._retained = False # if True, the element is displayed once in a cached surface, then the surface is blitted (see set_retained)
+        self._retained_surface: pygame.Surface|None = None
+        self._retained_rect: pygame.Rect = pygame.Rect(0, 0, 0, 0) # the rect of the window displayed in the cached surface
+        self._displayed_rect: pygame.Rect = pygame.Rect(0, 0, 0, 0) # fit_in_parent_rect when the element was last displayed
         self.anchor = anchor
         self._visible = visible
         self._hovered = False
@@ -69,7 +76,17 @@ class UIElement(UIElementInterface):
         self._ui_manager.add_element(self)
         self.background_image: pygame.Surface|None = None
         self.set_background_image(background_image)
-        self.update_element()
+        self._update_created_element()
+
+    def _update_created_element(self) -> None:
+        """
+        Update the layout of the element at the end of its creation.
+        If a batch is running, the element is not themed yet, so its layout is only asked and done at the end of the batch.
+        """
+        if self._ui_manager.is_batching():
+            self.ask_layout_update()
+        else:
+            self.update_element()
 
 
     def set_background_image(self, background_image: str|pygame.Surface|None=None) -> None:
@@ -81,37 +98,81 @@ class UIElement(UIElementInterface):
         else:
             self.background_image = background_image
         self.scaled_background_image: pygame.Surface|None = None
+        self.invalidate_retained_surface()
 
     def _resize_background_image(self) -> None:
         if self.background_image is not None:
             width, height = self.get_size()
-            self.scaled_background_image = pygame.transform.scale(self.background_image, (width - 2*self._border_width, height - 2*self._border_width))
+            size = (width - 2*self._border_width, height - 2*self._border_width)
+            if self.scaled_background_image is not None and self.scaled_background_image.get_size() == size: return
+            self.scaled_background_image = pygame.transform.scale(self.background_image, size)
         
     def update_element(self) -> None:
+        """
+        Update the layout of the element and of its children in two passes:
+        the measure pass goes from the children to the parents, so each element is measured with the sizes of its children,
+        then the arrange pass goes from the parents to the children, so each element is placed with the final size of its parent.
+        Each element is visited once by each pass, so it is not laid out again by the next layout pass (see UIManager.update_layout).
+        """
+        self._ui_manager.discard_layout_update(self)
+        self.measure_tree()
+        self.arrange()
+
+    def measure_tree(self) -> None:
+        """Measure the children of the element, then the element (see measure)"""
+        for child in self.get_children():
+            child.measure_tree()
+        self.measure()
+
+    def measure(self) -> None:
+        """
+        Measure the content of the element, with the sizes of its children already measured,
+        and set its size from it, without filling its parent (the sizes in percents use the actual size of the parent).
+        """
+        self._content_size = self.get_content_size()
+        self.update_size(fill_parent=False)
+        self._measured_size = self._size
+
+    def update_child_size(self, child: UIElementInterface) -> None:
+        """Called by the layout pass when the measured size of a child changed, before the element is measured again"""
+
+    def arrange(self) -> None:
+        """
+        Set the final size of the element from its measured content and the final size of its parent,
+        then its coords and the part of it who fit in its parent, then arrange its children.
+        """
         self.update_size()
         self.update_start_coords()
         self.set_fit_in_parent_rect()
         self._resize_background_image()
+        self.invalidate_retained_surface()
+
+    def ask_layout_update(self) -> None:
+        """
+        Tell the manager the content of the element changed. The layout is updated once per frame (see UIManager.update_layout):
+        the element is measured again, then its parents up to the first one whose size doesn't change,
+        and only the children of this one are arranged again.
+        """
+        self._content_size = None
+        self._ui_manager.ask_layout_update(self)
 
     def update_theme(self, theme_dict: dict[str, dict[str, Any]], erase: bool=False) -> None:
-        """If erase is False, only the changed and added values will be set"""
-        if erase:
-            self._theme.clear()
-        for element_name in self.theme_elements_name:
-            if element_name in theme_dict:
-                self._theme.update(theme_dict[element_name])
+        """
+        If erase is False, only the changed and added values will be set.
+        The resolved theme is shared with all the elements having the same names, classes and parents names and classes,
+        so it must never be modified.
+        """
+        parents_names: list[tuple[tuple[str, ...], tuple[str, ...]]] = []
         parent = self.parent
         while parent is not None:
-            for parent_theme_name in parent.theme_elements_name:
-                if f'{parent_theme_name}:child' in theme_dict:
-                    self._theme.update(theme_dict[f'{parent_theme_name}:child'])
-            for parent_class_name in parent.classes_names:
-                if f':{parent_class_name}:child' in theme_dict:
-                    self._theme.update(theme_dict[f':{parent_class_name}:child'])
+            parents_names.append((tuple(parent.theme_elements_name), tuple(parent.classes_names)))
             parent = parent.parent
-        for name in self.classes_names:
-            if f':{name}' in theme_dict:
-                self._theme.update(theme_dict[f':{name}'])
+        theme = self._ui_manager.get_resolved_theme(theme_dict, tuple(self.theme_elements_name), tuple(self.classes_names), tuple(parents_names))
+        self.invalidate_retained_surface()
+        if erase or self._theme.keys() <= theme.keys():
+            self._theme = theme
+        else:
+            self._theme = MappingProxyType({**self._theme, **theme})
         border_width = self.get_theme_value('border-width')
         if border_width is None: return
         self._border_width = max(0, border_width)
@@ -188,21 +249,21 @@ class UIElement(UIElementInterface):
             parent_size = self._ui_manager.get_window_size()[1]
         return parent_size * int(height) // 100
 
-    def update_size(self) -> None:
+    def update_size(self, fill_parent: bool=True) -> None:
         width, height = self._first_size
         if isinstance(width, str):
             width = self.get_relative_width(width)
         if isinstance(height, str):
             height = self.get_relative_height(height)
         if self._relative_width or self._relative_height:
-            content_width, content_height = self.get_content_size()
+            content_width, content_height = self._get_content_size()
         if self._relative_width:
             width = content_width
         if self._relative_height:
             height = content_height
-        if self.fill_parent_width:
+        if fill_parent and self.fill_parent_width:
             width = self.parent._size[0]
-        if self.fill_parent_height:
+        if fill_parent and self.fill_parent_height:
             height = self.parent._size[1]
         self._size = (width, height)
 
@@ -235,9 +296,19 @@ class UIElement(UIElementInterface):
     def get_content_size(self) -> tuple[int, int]:
         raise NotImplementedError
 
+    def _get_content_size(self) -> tuple[int, int]:
+        """Returns the content size cached by measure, or measures it if the element asked a layout update since"""
+        if self._content_size is None:
+            self._content_size = self.get_content_size()
+        return self._content_size
+
     def get_size(self) -> tuple[int, int]:
         return self._size
 
+    def get_measured_size(self) -> tuple[int, int]:
+        """Returns the size of the element set by the measure pass, so the size it needs, before filling its parent"""
+        return self._measured_size
+
     def is_in_element(self, x: int, y: int) -> bool:
         return self.fit_in_parent_rect[0] <= x <= self.fit_in_parent_rect[0] + self.fit_in_parent_rect[2] and self.fit_in_parent_rect[1] <= y <= self.fit_in_parent_rect[1] + self.fit_in_parent_rect[3]
 
@@ -246,12 +317,14 @@ class UIElement(UIElementInterface):
     
     def set_visibility(self, visible: bool) -> None:
         self._visible = visible
-        self._ui_manager.ask_refresh()
+        self._ui_manager.ask_refresh(self)
+        self._ui_manager.ask_hover_update()
     
     def toggle_visibility(self) -> bool:
         """Returns True if visible else False"""
         self._visible = not self._visible
-        self._ui_manager.ask_refresh()
+        self._ui_manager.ask_refresh(self)
+        self._ui_manager.ask_hover_update()
         return self._visible
 
     def set_focus(self, focus: bool) -> bool:
@@ -262,32 +335,95 @@ class UIElement(UIElementInterface):
         return self._focus
 
     def set_selected(self, selected: bool) -> None:
+        if selected == self._selected: return
         self._selected = selected
         if self.get_theme_value('selected-border-color') is not None:
             self._ui_manager.ask_refresh(self)
 
     def set_clicked(self, clicked: bool) -> None:
+        if clicked == self._clicked: return
         self._clicked = clicked
         if self.get_theme_value('clicked-border-color') is not None:
             self._ui_manager.ask_refresh(self)
 
     def set_unclicked(self, unclicked: bool) -> None:
+        if unclicked == self._unclicked: return
         self._unclicked = unclicked
         if self.get_theme_value('unclicked-border-color') is not None:
             self._ui_manager.ask_refresh(self)
 
     def set_hovered(self, hovered: bool) -> None:
+        if hovered == self._hovered: return
         self._hovered = hovered
         if self.get_theme_value('hovered-border-color') is not None:
             self._ui_manager.ask_refresh(self)
 
+    def set_hovered_pos(self, x: int, y: int) -> None:
+        """Called by the manager with the mouse coords each time the mouse moves over the element"""
+
     def is_focusable(self) -> bool:
         return self._can_have_focus
 
     def display_element(self) -> None:
         """Check whether the element can be displayed before calling the display method"""
         if self._visible:
+            self.display_clipped()
+
+    def display_clipped(self) -> None:
+        """
+        Display the element with the window clip set to the part of the element who fit in its parent,
+        so nothing is drawn outside of it.
+        Does nothing if this part is out of the actual clip, like when only a part of the window is displayed again.
+        """
+        window = self._ui_manager.get_window()
+        previous_clip = window.get_clip()
+        clip = self.fit_in_parent_rect.clip(previous_clip)
+        if clip.width == 0 or clip.height == 0: return
+        self._displayed_rect = self.fit_in_parent_rect.copy()
+        window.set_clip(clip)
+        if self._retained:
+            self._display_retained(window)
+        else:
             self._display()
+        window.set_clip(previous_clip)
+
+    def set_retained(self, retained: bool) -> None:
+        """
+        If retained is True, the element and its children are displayed once in a cached surface,
+        then each display only blits this surface, until the cache is invalidated (see invalidate_retained_surface).
+        Useful for static elements with a lot of children, since a refresh of the element is then a single blit.
+        """
+        self._retained = retained
+        self._retained_surface = None
+
+    def is_retained(self) -> bool:
+        return self._retained
+
+    def get_displayed_rect(self) -> pygame.Rect:
+        """Returns the part of the window where the element was displayed the last time (its fit_in_parent_rect at this time)"""
+        return self._displayed_rect
+
+    def invalidate_retained_surface(self) -> None:
+        """
+        Drop the cached surfaces of the element and of its parents, so they are displayed again the next time.
+        Called when the theme or the layout of the element changes, and when it asks to be refreshed.
+        """
+        element = self
+        while element is not None:
+            element._retained_surface = None
+            element = element.parent
+
+    def _display_retained(self, window: pygame.Surface) -> None:
+        """
+        Blit the cached surface of the element, after displaying the whole element in it if it was invalidated or moved,
+        even if only a part of it is displayed again (like in a partial refresh), since the blit is clipped.
+        """
+        rect = self.fit_in_parent_rect.clip(window.get_rect())
+        if rect.width == 0 or rect.height == 0: return
+        if self._retained_surface is None or rect != self._retained_rect:
+            self._retained_surface = self._ui_manager.render_element(self, rect)
+            self._retained_rect = rect
+        window.blit(self._retained_surface, rect)
     
     def _display(self) -> None:
         """Should not be called directly by external programs but using display_element method"""
@@ -348,6 +484,9 @@ class UIElement(UIElementInterface):
     def get_parent(self) -> UIElementInterface|None:
         return self.parent
 
+    def get_children(self) -> list[UIElementInterface]:
+        return []
+
     def __copy__(self) -> "UIElement":
         return UIElement(self._ui_manager, *self._first_coords, *self._first_size, self.anchor, self._visible, None, self.theme_elements_name, self.classes_names, self.background_image)
 
@@ -2,7 +2,7 @@ from abc import abstractmethod, ABCMeta
 from typing import Any
 
 from pygame.event import Event
-from pygame import Rect
+from pygame import Rect, Surface
 
 class UIElementInterface(metaclass=ABCMeta):
     @abstractmethod
@@ -37,9 +37,29 @@ class UIElementInterface(metaclass=ABCMeta):
         pass
 
     @abstractmethod
-    def update_size(self) -> None:
+    def update_size(self, fill_parent: bool=True) -> None:
         pass
 
+    @abstractmethod
+    def measure_tree(self) -> None:
+        """Measure the children of the element, then the element"""
+
+    @abstractmethod
+    def measure(self) -> None:
+        """Measure the element with the sizes of its children"""
+
+    @abstractmethod
+    def update_child_size(self, child: "UIElementInterface") -> None:
+        """Called by the layout pass when the measured size of a child changed, before the element is measured again"""
+
+    @abstractmethod
+    def arrange(self) -> None:
+        """Set the final size and the coords of the element from its parent, then arrange its children"""
+
+    @abstractmethod
+    def ask_layout_update(self) -> None:
+        """Ask the manager to measure the element again in the next layout pass"""
+
     @abstractmethod
     def get_content_size(self) -> tuple[int, int]:
         pass
@@ -48,6 +68,10 @@ class UIElementInterface(metaclass=ABCMeta):
     def get_size(self) -> tuple[int, int]:
         pass
 
+    @abstractmethod
+    def get_measured_size(self) -> tuple[int, int]:
+        """Returns the size of the element before filling its parent"""
+
     @abstractmethod
     def is_in_element(self, x: int, y: int) -> bool:
         pass
@@ -84,6 +108,10 @@ class UIElementInterface(metaclass=ABCMeta):
     def set_hovered(self, hovered: bool) -> None:
         pass
 
+    @abstractmethod
+    def set_hovered_pos(self, x: int, y: int) -> None:
+        """Called by the manager with the mouse coords each time the mouse moves over the element"""
+
     @abstractmethod
     def is_focusable(self) -> bool:
         pass
@@ -92,6 +120,30 @@ class UIElementInterface(metaclass=ABCMeta):
     def display_element(self) -> None:
         """Check whether the element can be displayed before calling the display method"""
 
+    @abstractmethod
+    def display_clipped(self) -> None:
+        """Display the element without drawing outside of the part of the element who fit in its parent"""
+
+    @abstractmethod
+    def set_retained(self, retained: bool) -> None:
+        """If retained is True, the element is displayed in a cached surface, who is blitted until it is invalidated"""
+
+    @abstractmethod
+    def is_retained(self) -> bool:
+        pass
+
+    @abstractmethod
+    def get_displayed_rect(self) -> Rect:
+        """Returns the part of the window where the element was displayed the last time"""
+
+    @abstractmethod
+    def invalidate_retained_surface(self) -> None:
+        """Drop the cached surfaces of the element and of its parents"""
+
+    @abstractmethod
+    def _display_retained(self, window: Surface) -> None:
+        """Blit the cached surface of the element, after displaying the element in it if needed"""
+
     @abstractmethod
     def _display(self) -> None:
         """Should not be called directly but using display_element method"""
@@ -120,4 +172,8 @@ class UIElementInterface(metaclass=ABCMeta):
     
     @abstractmethod
     def get_parent(self) -> 'UIElementInterface|None':
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def get_children(self) -> 'list[UIElementInterface]':
+        """Returns the elements displayed inside this one, in display order"""
\ No newline at end of file
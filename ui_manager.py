@@ -2,8 +2,10 @@ import pygame
 from ui_element_interface import UIElementInterface
 from ui_manager_interface import UIManagerInterface
 
+from contextlib import contextmanager
 from json import load, JSONDecodeError
-from typing import Any
+from typing import Any, Iterator, Mapping
+from types import MappingProxyType
 import os
 
 ELEMENT_HOVERED = pygame.event.custom_type()
@@ -14,13 +16,33 @@ ELEMENT_WHEEL_MOVED = pygame.event.custom_type()
 class UIManager(UIManagerInterface):
     def __init__(self, window: pygame.Surface, window_background_image: str|pygame.Surface|None=None) -> None:
         self.window: pygame.Surface = window
-        self._elements: list[UIElementInterface] = []
+        self._elements: dict[UIElementInterface, None] = {} # in registration order, a dict so removing an element is O(1)
+        self._root_elements: list[UIElementInterface] = [] # elements without parent, hit testing starts from them
+        self._elements_order: dict[UIElementInterface, int] = {} # registration order, used to sort hit testing results
+        self._next_element_order = 0
         self._elements_to_display: list[UIElementInterface] = []
         self._refresh_all = False
+        self._rects_to_display: list[pygame.Rect] = [] # parts of the window to display again, like where a removed element was
+        self._dirty_rects: list[pygame.Rect] = []
+        self._background_layer: pygame.Surface|None = None # the window background, see _get_background_layer
+        self._background_layer_key: tuple|None = None
+        self._render_surfaces: list[pygame.Surface] = [] # transparent surfaces where the retained elements are displayed, one by depth
+        self._render_targets: list[pygame.Surface] = [] # the surfaces where the elements are being displayed instead of the window
         self._focused_element: UIElementInterface|None = None
         self._clicked_elements: set[UIElementInterface] = set()
         self._unclicked_elements: set[UIElementInterface] = set()
-        self._hovered_elements: set[UIElementInterface] = set()
+        self._hovered_elements: list[UIElementInterface] = [] # in registration order
+        self._elements_to_update: set[UIElementInterface] = set() # the clicked and unclicked elements are always updated too
+        self._elements_to_layout: set[UIElementInterface] = set() # the elements whose content changed, see update_layout
+        self._mouse_pos: tuple[int, int]|None = pygame.mouse.get_pos() # None when the mouse is out of the window
+        self._hover_outdated = True
+        self._events_to_post: list[pygame.event.Event] = [] # posted all at once at the end of update
+        self._batch_depth = 0 # number of nested batch blocks being executed, see batch
+        self._elements_to_theme: dict[UIElementInterface, bool] = {} # the elements whose theme is deferred, with their erase value
+        self._batch_refresh_all = False
+        self._batch_elements_to_display: dict[UIElementInterface, None] = {} # a dict to keep the order and remove duplicates
+        # resolved themes of the elements, by elements names, classes names and parents names and classes names
+        self._resolved_themes: dict[tuple, Mapping[str, Any]] = {}
         self._theme = self.get_theme(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'default_theme.json'))
         if not self._theme:
             raise FileNotFoundError("Can't find default theme file or file is not valid json")
@@ -39,6 +61,25 @@ class UIManager(UIManagerInterface):
         if self.background_image is not None:
             self.scaled_background_image = pygame.transform.scale(self.background_image, self.get_window_size())
 
+    def _get_background_layer(self) -> pygame.Surface:
+        """
+        Returns a surface of the size of the window with the window background color or image,
+        who is blitted under the parts of the window who are displayed again instead of filling them.
+        It is created again only when the window size or the background changes.
+        """
+        background_color = tuple(pygame.Color(self._theme['window']['background-color']))
+        key = (self.window.get_size(), id(self.background_image), background_color)
+        if key == self._background_layer_key: return self._background_layer
+        if self.scaled_background_image is not None and self.scaled_background_image.get_size() != self.window.get_size():
+            self._resize_background_image()
+        self._background_layer = pygame.Surface(self.window.get_size(), 0, self.window)
+        if self.background_image is not None:
+            self._background_layer.blit(self.scaled_background_image, (0, 0))
+        else:
+            self._background_layer.fill(background_color)
+        self._background_layer_key = key
+        return self._background_layer
+
     def get_theme(self, path: str) -> dict[str, Any]:
         try:
             with open(path) as f:
@@ -48,6 +89,7 @@ class UIManager(UIManagerInterface):
             return {}
     
     def _update_elements_themes(self, theme: dict[str,dict[str,Any]]) -> None:
+        self._resolved_themes.clear()
         for element_theme in theme:
             if element_theme in self._theme:
                 self._theme[element_theme].update(theme[element_theme])
@@ -57,6 +99,7 @@ class UIManager(UIManagerInterface):
     def update_theme(self, path: str|None=None, theme_dict: dict[str, Any]|None=None, erase: bool=False) -> None:
         if erase:
             self._theme.clear()
+            self._resolved_themes.clear()
         changed = False
         if path is not None:
             changed = True
@@ -65,28 +108,133 @@ class UIManager(UIManagerInterface):
             changed = True
             self._update_elements_themes(theme_dict)
         if changed:
-            for element in self._elements:
-                element.update_theme(self._theme, erase)
-                element.update_element()
-            self.ask_refresh()
+            with self.batch():
+                for element in self._elements:
+                    self.update_element_theme(element, erase)
+                self.ask_refresh()
 
     def update_element_theme(self, element: UIElementInterface, erase: bool=False) -> None:
+        """Resolve the theme of the element and of its children, or at the end of the batch if one is running (see batch)"""
+        if self._batch_depth:
+            self._elements_to_theme[element] = self._elements_to_theme.get(element, False) or erase
+            return
         element.update_theme(self._theme, erase)
 
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Defer the themes resolutions, the layout updates and the refresh requests until the end of the block,
+        then apply them once: each element whose theme was asked is themed with its children (once, even if it was asked
+        by several containers), the layout pass runs once for all of them, and the refresh requests are merged.
+        Can be used as a context manager ('with ui_manager.batch():') or as a decorator ('@ui_manager.batch()'), and nested.
+        The elements created in the block are themed only at its end, so their sizes depending on their themes
+        (like the size of a text) are not known until then.
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._end_batch()
+
+    def is_batching(self) -> bool:
+        return self._batch_depth > 0
+
+    def _end_batch(self) -> None:
+        elements_to_theme = {element: erase for element, erase in self._elements_to_theme.items() if element in self._elements_order}
+        self._elements_to_theme = {}
+        elements = set(elements_to_theme)
+        for element, erase in elements_to_theme.items():
+            if self._has_ancestor_in(element, elements): continue # themed by the theme update of its ancestor
+            element.update_theme(self._theme, erase)
+            element.ask_layout_update()
+        self.update_layout()
+        if self._batch_refresh_all:
+            self._batch_refresh_all = False
+            self._batch_elements_to_display.clear()
+            self.ask_refresh()
+        elif self._batch_elements_to_display:
+            elements_to_display = [element for element in self._batch_elements_to_display if element in self._elements_order]
+            self._batch_elements_to_display.clear()
+            self.ask_refresh(elements_to_display)
+
+    def get_resolved_theme(
+            self,
+            theme_dict: dict[str, dict[str, Any]],
+            theme_elements_name: tuple[str, ...],
+            classes_names: tuple[str, ...],
+            parents_names: tuple[tuple[tuple[str, ...], tuple[str, ...]], ...]) -> Mapping[str, Any]:
+        """
+        Returns the theme values of an element, read-only.
+        parents_names contains the themes' names and the classes names of each parent, from the closest to the farthest.
+        The result is cached while the theme of the manager doesn't change,
+        so elements with the same names and parents share the same theme object.
+        """
+        key = (theme_elements_name, classes_names, parents_names)
+        if theme_dict is self._theme and key in self._resolved_themes:
+            return self._resolved_themes[key]
+        theme: dict[str, Any] = {}
+        for element_name in theme_elements_name:
+            if element_name in theme_dict:
+                theme.update(theme_dict[element_name])
+        for parent_theme_elements_name, parent_classes_names in parents_names:
+            for parent_theme_name in parent_theme_elements_name:
+                if f'{parent_theme_name}:child' in theme_dict:
+                    theme.update(theme_dict[f'{parent_theme_name}:child'])
+            for parent_class_name in parent_classes_names:
+                if f':{parent_class_name}:child' in theme_dict:
+                    theme.update(theme_dict[f':{parent_class_name}:child'])
+        for name in classes_names:
+            if f':{name}' in theme_dict:
+                theme.update(theme_dict[f':{name}'])
+        resolved_theme = MappingProxyType(theme)
+        if theme_dict is self._theme:
+            self._resolved_themes[key] = resolved_theme
+        return resolved_theme
+
     def get_window_size(self) -> tuple[int, int]:
         return self.window.get_size()
 
     def get_window(self) -> pygame.Surface:
-        return self.window
+        """Returns the surface where the elements must be displayed: the window, or a surface if a retained element is being rendered"""
+        return self._render_targets[-1] if self._render_targets else self.window
+
+    def render_element(self, element: UIElementInterface, rect: pygame.Rect) -> pygame.Surface:
+        """
+        Display the element in a transparent surface of the size of the window instead of the window,
+        and returns a copy of the part of the surface in the rect (see UIElement.set_retained).
+        The retained elements displayed by the element are rendered in another surface.
+        """
+        depth = len(self._render_targets)
+        if depth == len(self._render_surfaces):
+            self._render_surfaces.append(pygame.Surface(self.window.get_size(), pygame.SRCALPHA))
+        elif self._render_surfaces[depth].get_size() != self.window.get_size():
+            self._render_surfaces[depth] = pygame.Surface(self.window.get_size(), pygame.SRCALPHA)
+        surface = self._render_surfaces[depth]
+        surface.set_clip(rect)
+        surface.fill((0, 0, 0, 0), rect)
+        self._render_targets.append(surface)
+        try:
+            element._display()
+        finally:
+            self._render_targets.pop()
+        return surface.subsurface(rect).copy()
 
     def add_element(self, element: UIElementInterface) -> None:
-        self._elements.append(element)
-        element.update_theme(self._theme)
+        self._elements[element] = None
+        self._elements_order[element] = self._next_element_order
+        self._next_element_order += 1
+        if element.get_parent() is None:
+            self._root_elements.append(element)
+        self.update_element_theme(element)
         self.ask_refresh()
     
     def remove_element(self, element: UIElementInterface) -> None:
-        if element in self._elements:
-            self._elements.remove(element)
+        self._elements.pop(element, None)
+        if element in self._root_elements:
+            self._root_elements.remove(element)
+        self._elements_order.pop(element, None)
         if element in self._elements_to_display:
             self._elements_to_display.remove(element)
         if element in self._clicked_elements:
@@ -95,29 +243,57 @@ class UIManager(UIManagerInterface):
             self._unclicked_elements.remove(element)
         if element in self._hovered_elements:
             self._hovered_elements.remove(element)
+        self._elements_to_update.discard(element)
+        self._elements_to_layout.discard(element)
+        self._elements_to_theme.pop(element, None)
+        self._batch_elements_to_display.pop(element, None)
         if self._focused_element == element:
             self._focused_element = None
-        self.ask_refresh()
+        self._rects_to_display.append(element.get_displayed_rect())
+        self.ask_hover_update()
 
     def delete_all_elements(self) -> None:
         self._elements.clear()
+        self._root_elements.clear()
+        self._elements_order.clear()
         self._elements_to_display.clear()
         self._clicked_elements.clear()
         self._unclicked_elements.clear()
         self._hovered_elements.clear()
+        self._elements_to_update.clear()
+        self._elements_to_layout.clear()
+        self._elements_to_theme.clear()
+        self._batch_elements_to_display.clear()
+        self._rects_to_display.clear()
+        self._events_to_post.clear()
         self.set_focus(None)
         self.ask_refresh()
 
     def ask_refresh(self, element: UIElementInterface|list[UIElementInterface]|None=None) -> None:
         """
         Ask the UIManager to re-display the window the next time it will be called for an update.
-        If an element is given, it will only re-display the element.
-
-        Note: If an element or a list of element is given, it will display it without caring of a size change, 
-        so it should be given only if the starting coords and the size are the same as at the last refresh.
+        If an element is given, it will only re-display the part of the window where the element was displayed
+        and the part where it is now: the background is restored there, then the elements who overlap it are displayed again
+        in order (see display), so the element can have moved, shrunk or be hidden since its last display.
+        During a batch, the requests are merged and made at its end (see batch).
+        The cached surfaces of the given elements are invalidated (see UIElement.set_retained).
         """
+        if isinstance(element, UIElementInterface):
+            element.invalidate_retained_surface()
+        elif element is not None:
+            for e in element:
+                e.invalidate_retained_surface()
+        if self._batch_depth:
+            if element is None:
+                self._batch_refresh_all = True
+            elif isinstance(element, UIElementInterface):
+                self._batch_elements_to_display[element] = None
+            else:
+                self._batch_elements_to_display.update(dict.fromkeys(element))
+            return
         if element is None:
             self._refresh_all = True
+            self._hover_outdated = True # the layout may have changed under the mouse
             return
         if isinstance(element, UIElementInterface):
             if element in self._elements_to_display: return
@@ -127,61 +303,270 @@ class UIManager(UIManagerInterface):
                 if e in self._elements_to_display: continue
                 self._elements_to_display.append(e)
 
-    def display(self, clear: bool=True) -> None:
+    def ask_hover_update(self) -> None:
+        """
+        Ask the UIManager to compute the hovered elements again,
+        because the elements under the mouse changed without a full refresh (like when scrolling).
+        """
+        self._hover_outdated = True
+
+    def ask_update(self, element: UIElementInterface) -> None:
+        """
+        Ask the UIManager to call the update method of the element the next time it will be updated.
+        Only the elements who asked it, the clicked, the unclicked, the scrolled elements
+        and the elements who gained or lost the focus are updated,
+        so an element who needs to be updated at each frame (like an animation) must ask it again in its update method.
+        """
+        self._elements_to_update.add(element)
+
+    def ask_layout_update(self, element: UIElementInterface) -> None:
+        """Ask the UIManager to measure the element again in the next layout pass (see update_layout)"""
+        self._elements_to_layout.add(element)
+
+    def discard_layout_update(self, element: UIElementInterface) -> None:
+        """
+        Remove the element and its children from the elements to lay out in the next layout pass,
+        when they were just laid out (see UIElement.update_element).
+        """
+        if not self._elements_to_layout: return
+        elements = [element]
+        while elements:
+            element = elements.pop()
+            self._elements_to_layout.discard(element)
+            elements.extend(element.get_children())
+
+    def _has_ancestor_in(self, element: UIElementInterface, elements: set[UIElementInterface]) -> bool:
+        parent = element.get_parent()
+        while parent is not None:
+            if parent in elements:
+                return True
+            parent = parent.get_parent()
+        return False
+
+    def update_layout(self) -> None:
+        """
+        Update the layout of the elements who asked it (see ask_layout_update).
+        Each element is measured again with its children, then its parents are measured again with their children sizes,
+        up to the first one whose measured size doesn't change, and only this one and its children are arranged again,
+        with their cached content sizes (see UIElement.arrange).
+        The measured sizes are compared, since the size of an element filling its parent doesn't change with its content.
+        An element whose parent asked it too is skipped, since the update of the parent updates it.
+        If no size changed, only the elements are displayed again, else the arranged elements (see ask_refresh).
+        Called once per frame at the end of update, it can be called before to get the layout of the changed elements.
+        Does nothing during a batch, the layout is updated at its end (see batch).
+        """
+        if not self._elements_to_layout or self._batch_depth: return
+        elements = {element for element in self._elements_to_layout if element in self._elements_order}
+        self._elements_to_layout = set()
+        elements_to_arrange: set[UIElementInterface] = set()
+        size_changed = False
+        for element in elements:
+            if self._has_ancestor_in(element, elements): continue
+            previous_size = element.get_measured_size()
+            element.measure_tree()
+            if element.get_measured_size() == previous_size:
+                element.arrange()
+                self.ask_refresh(element)
+                continue
+            size_changed = True
+            while True:
+                parent = element.get_parent()
+                if parent is None: break
+                previous_size = parent.get_measured_size()
+                parent.update_child_size(element)
+                parent.measure()
+                element = parent
+                if parent.get_measured_size() == previous_size: break
+            elements_to_arrange.add(element)
+        for element in elements_to_arrange:
+            if self._has_ancestor_in(element, elements_to_arrange): continue
+            element.arrange()
+            self.ask_refresh(element)
+        if size_changed:
+            self.ask_hover_update()
+
+    def display(self, clear: bool=True) -> list[pygame.Rect]:
         """
-        If clear is set to True, will fill the window with the background color or imag
+        If clear is set to True, will restore the background color or image (see _get_background_layer) under the displayed parts.
+        Only the elements without parent are displayed, since each element displays its children.
+        On a partial refresh, the window is clipped to each part to display again,
+        so only the elements who overlap it are displayed, from the bottom to the top.
+        Returns the rects of the window who were re-displayed (see get_dirty_rects).
         """
         if self._refresh_all:
             if clear:
-                if self.background_image is not None:
-                    self.window.blit(self.scaled_background_image, (0, 0))
-                else:
-                    self.window.fill(self._theme['window']['background-color'])
-            elements = self._elements
+                self.window.blit(self._get_background_layer(), (0, 0))
+            self._dirty_rects = [self.window.get_rect()]
+            for element in self._get_root_elements():
+                element.display_element()
         else:
-            elements = self._elements_to_display
-        for element in elements:
-            element.display_element()
+            rects = self._rects_to_display
+            for element in self._elements_to_display:
+                if element.get_visibility():
+                    rects.append(element.fit_in_parent_rect)
+                rects.append(element.get_displayed_rect())
+            self._dirty_rects = self._merge_rects(rects)
+            previous_clip = self.window.get_clip()
+            for rect in self._dirty_rects:
+                self.window.set_clip(rect)
+                if clear:
+                    self.window.blit(self._get_background_layer(), rect, rect)
+                for element in self._get_root_elements():
+                    element.display_element()
+            self.window.set_clip(previous_clip)
         self._refresh_all = False
+        self._rects_to_display = []
         self._elements_to_display.clear()
         for element in self._unclicked_elements:
             element.set_unclicked(False)
         self._unclicked_elements.clear()
-    
-    def get_hovered_element(self) -> list[UIElementInterface]:
-        x, y = pygame.mouse.get_pos()
-        return [element for element in self._elements if element.is_in_element(x, y)]
+        return self._dirty_rects
+
+    def _merge_rects(self, rects: list[pygame.Rect]) -> list[pygame.Rect]:
+        """
+        Clip the rects to the window and merge the ones who overlap,
+        so each part of the window is in at most one rect.
+        """
+        window_rect = self.window.get_rect()
+        merged_rects: list[pygame.Rect] = []
+        for rect in rects:
+            rect = rect.clip(window_rect)
+            if rect.width == 0 or rect.height == 0: continue
+            index = rect.collidelist(merged_rects)
+            while index != -1:
+                rect.union_ip(merged_rects.pop(index))
+                index = rect.collidelist(merged_rects)
+            merged_rects.append(rect)
+        return merged_rects
+
+    def get_dirty_rects(self) -> list[pygame.Rect]:
+        """
+        Returns the rects of the window who were re-displayed during the last call to display,
+        so they can be given to pygame.display.update instead of flipping the whole window.
+        """
+        return self._dirty_rects
+
+    def _get_root_elements(self) -> list[UIElementInterface]:
+        """
+        Returns the elements without parent.
+        An element can get a parent after being registered (with Container.add_element),
+        so the list is cleaned when such an element is found.
+        """
+        for element in self._root_elements:
+            if element.get_parent() is not None:
+                self._root_elements = [element for element in self._root_elements if element.get_parent() is None]
+                break
+        return self._root_elements
+
+    def get_hovered_element(self, pos: tuple[int, int]|None=None) -> list[UIElementInterface]:
+        """
+        Returns all the elements under the given position (or the mouse if not given), in registration order.
+        The elements tree is walked from the roots, and the childs of an element are only tested
+        if the point is in the element, since childs are always fit in the rect of their parent.
+        """
+        x, y = pygame.mouse.get_pos() if pos is None else pos
+        hovered_elements: list[UIElementInterface] = []
+        elements = [element for element in self._get_root_elements() if element.is_in_element(x, y)]
+        while elements:
+            element = elements.pop()
+            hovered_elements.append(element)
+            for child in element.get_children():
+                if child.is_in_element(x, y):
+                    elements.append(child)
+        hovered_elements.sort(key=lambda element: self._elements_order.get(element, -1))
+        return hovered_elements
+
+    def get_deepest_hovered_element(self, pos: tuple[int, int]|None=None) -> UIElementInterface|None:
+        """
+        Returns the deepest element under the given position (or the mouse if not given).
+        When siblings overlap, the last displayed one (the one on top) is chosen.
+        """
+        x, y = pygame.mouse.get_pos() if pos is None else pos
+        deepest_element = None
+        elements = self._get_root_elements()
+        while True:
+            for element in reversed(elements):
+                if element.is_in_element(x, y):
+                    deepest_element = element
+                    elements = element.get_children()
+                    break
+            else:
+                return deepest_element
 
     def set_focus(self, element: UIElementInterface|None) -> None:
         if self._focused_element is not None:
             self._focused_element.set_focus(False)
+            self.ask_update(self._focused_element)
         self._focused_element = element
         if element is not None:
             element.set_focus(True)
+            self.ask_update(element)
     
     def get_focus(self) -> UIElementInterface|None:
         return self._focused_element
 
     def resize_window(self) -> None:
-        for element in self._elements:
+        for element in list(self._elements):
             element.update_element()
             self.ask_refresh()
 
+    def _set_mouse_pos(self, pos: tuple[int, int]|None) -> None:
+        if pos != self._mouse_pos:
+            self._mouse_pos = pos
+            self._hover_outdated = True
+
+    def _update_hovered_elements(self) -> None:
+        """
+        Set for elements if they are hovered or not.
+        Does nothing if the mouse didn't move and the layout didn't change since the last call.
+        Only the elements who were entered or left are changed, and an ELEMENT_HOVERED event is created for each of them.
+        The mouse coords are given to all the hovered elements (see UIElement.set_hovered_pos).
+        """
+        if not self._hover_outdated: return
+        self._hover_outdated = False
+        hovered_elements = [] if self._mouse_pos is None else self.get_hovered_element(self._mouse_pos)
+        still_hovered_elements = set(hovered_elements)
+        for element in self._hovered_elements:
+            if element in still_hovered_elements: continue
+            element.set_hovered(False)
+            self._add_event(ELEMENT_HOVERED, element, hovered=False)
+        previously_hovered_elements = set(self._hovered_elements)
+        for element in hovered_elements:
+            if element in previously_hovered_elements: continue
+            element.set_hovered(True)
+            self._add_event(ELEMENT_HOVERED, element, hovered=True)
+        self._hovered_elements = hovered_elements
+        if self._mouse_pos is not None:
+            for element in hovered_elements:
+                element.set_hovered_pos(*self._mouse_pos)
+
+    def _add_event(self, event_type: int, element: UIElementInterface, **attributes: Any) -> None:
+        """Add an event who will be posted with the others at the end of the next update"""
+        self._events_to_post.append(pygame.event.Event(event_type, element=element, **attributes))
+
+    def _post_events(self) -> None:
+        for event in self._events_to_post:
+            pygame.event.post(event)
+        self._events_to_post.clear()
+
     def click(self) -> None:
-        elements = self.get_hovered_element()
-        for element in elements:
+        self._update_hovered_elements()
+        for element in self._hovered_elements:
+            if element in self._clicked_elements: continue
             element.set_clicked(True)
             self._clicked_elements.add(element)
+            self._add_event(ELEMENT_CLICKED, element)
 
     def unclick(self) -> None:
-        elements = self.get_hovered_element()
+        self._update_hovered_elements()
         is_focused = False
         for element in self._clicked_elements:
             element.set_clicked(False)
             element.set_unclicked(True)
+            self._add_event(ELEMENT_UNCLICKED, element)
         self._unclicked_elements = self._unclicked_elements.union(self._clicked_elements)
         self._clicked_elements.clear()
-        for element in elements:
+        for element in self._hovered_elements:
             if not is_focused and element.is_focusable():
                 is_focused = True
                 if self.get_focus() != element:
@@ -193,25 +578,32 @@ class UIManager(UIManagerInterface):
     def scroll(self, x: int, y: int) -> None:
         if pygame.key.get_mods() & pygame.KMOD_SHIFT:
             x, y = y, x
-        elements = self.get_hovered_element()
-        for element in elements:
+        self._update_hovered_elements()
+        for element in self._hovered_elements:
             element.wheel_move = x, y
+            self.ask_update(element)
+            self._add_event(ELEMENT_WHEEL_MOVED, element, x=x, y=y)
 
     def process_event(self, event: pygame.event.Event) -> None:
         """
         Try to process the given events.
-        If the event is not MOUSEMOTION, MOUSEBUTTONDOWN, MOUSEBUTTONUP or MOUSEWHEEL,
-        if an element have the focus, the event will be sent to the focused element
+        If the event is not WINDOWLEAVE, MOUSEMOTION, MOUSEBUTTONDOWN, MOUSEBUTTONUP or MOUSEWHEEL,
+        if an element have the focus, the event will be sent to the focused element.
+        The hovered elements are only computed again after a MOUSEMOTION, a WINDOWLEAVE or a layout change.
         """
-        if event.type == pygame.WINDOWSIZECHANGED:
+        if event.type == pygame.WINDOWLEAVE:
+            self._set_mouse_pos(None)
+        elif event.type == pygame.WINDOWSIZECHANGED:
             self.resize_window()
         elif event.type == pygame.MOUSEMOTION:
-            pass
+            self._set_mouse_pos(event.pos)
         elif event.type == pygame.MOUSEBUTTONDOWN:
             if event.button in (4, 5): return # wheel
+            self._set_mouse_pos(event.pos)
             self.click()
         elif event.type == pygame.MOUSEBUTTONUP:
             if event.button in (4, 5): return # wheel
+            self._set_mouse_pos(event.pos)
             self.unclick()
         elif event.type == pygame.MOUSEWHEEL:
             self.scroll(event.x, event.y)
@@ -221,19 +613,21 @@ class UIManager(UIManagerInterface):
 
     def update(self) -> bool:
         """
-        Set for elements if they are hovered or not.
+        Set for elements if they are hovered or not, if the mouse moved or the layout changed.
         Re-display elements who need it.
-        Call the update method on all the elements.
+        Call the update method on the elements who need it (see ask_update), in registration order.
+        Update the layout of the elements whose content changed (see update_layout).
         Set unclicked to False for each unclicked elements.
+        Post the ELEMENT_HOVERED, ELEMENT_CLICKED, ELEMENT_UNCLICKED and ELEMENT_WHEEL_MOVED events created since the last update.
+        Each event have an 'element' attribute, ELEMENT_HOVERED events have a 'hovered' attribute
+        and ELEMENT_WHEEL_MOVED events have 'x' and 'y' attributes.
         """
-
-        for element in self._hovered_elements:
-            element.set_hovered(False)
-        self._hovered_elements.clear()
-        elements = self.get_hovered_element()
-        for element in elements:
-            element.set_hovered(True)
-            self._hovered_elements.add(element)
-        for element in self._elements:
+        self._update_hovered_elements()
+        elements = self._elements_to_update.union(self._clicked_elements, self._unclicked_elements)
+        self._elements_to_update = set()
+        for element in sorted(elements, key=lambda element: self._elements_order.get(element, -1)):
+            if element not in self._elements_order: continue # removed by the update of another element
             element.update()
-        return self._refresh_all or len(self._elements_to_display) != 0
\ No newline at end of file
+        self.update_layout()
+        self._post_events()
+        return self._refresh_all or len(self._elements_to_display) != 0 or len(self._rects_to_display) != 0
\ No newline at end of file
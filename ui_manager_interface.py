@@ -1,10 +1,11 @@
 from ui_element_interface import UIElementInterface
 from pygame.event import Event
 from abc import abstractmethod, ABCMeta
+from contextlib import AbstractContextManager
 
-from pygame import Surface
+from pygame import Surface, Rect
 
-from typing import Any
+from typing import Any, Mapping
 
 class UIManagerInterface(metaclass=ABCMeta):
     @abstractmethod
@@ -27,6 +28,26 @@ class UIManagerInterface(metaclass=ABCMeta):
     def update_element_theme(self, element: UIElementInterface, erase: bool=False) -> None:
         pass
 
+    @abstractmethod
+    def batch(self) -> AbstractContextManager[None]:
+        """Defer the themes resolutions, the layout updates and the refresh requests until the end of the block"""
+
+    @abstractmethod
+    def is_batching(self) -> bool:
+        """Returns True if a batch is running (see batch)"""
+
+    @abstractmethod
+    def get_resolved_theme(
+            self,
+            theme_dict: dict[str, dict[str, Any]],
+            theme_elements_name: tuple[str, ...],
+            classes_names: tuple[str, ...],
+            parents_names: tuple[tuple[tuple[str, ...], tuple[str, ...]], ...]) -> Mapping[str, Any]:
+        """
+        Returns the theme values of an element, read-only.
+        parents_names contains the themes' names and the classes names of each parent, from the closest to the farthest.
+        """
+
     @abstractmethod
     def get_window_size(self) -> tuple[int, int]:
         pass
@@ -35,6 +56,10 @@ class UIManagerInterface(metaclass=ABCMeta):
     def get_window(self) -> Surface:
         pass
 
+    @abstractmethod
+    def render_element(self, element: UIElementInterface, rect: Rect) -> Surface:
+        """Display the element in a transparent surface instead of the window, and returns the part of the surface in the rect"""
+
     @abstractmethod
     def add_element(self, element: UIElementInterface) -> None:
         pass
@@ -51,19 +76,47 @@ class UIManagerInterface(metaclass=ABCMeta):
     def ask_refresh(self, element: UIElementInterface|list[UIElementInterface]|None=None) -> None:
         """
         Ask the UIManager to re-display the window the next time it will be called for an update.
-        If an element is given, it will only re-display the element.
-
-        Note: If an element is given, it will display it without caring of a size change, 
-        so it should be given only if the starting coords and the size are the same as at the last refresh.
+        If an element is given, it will only re-display the parts of the window where the element was and is now displayed.
         """
     
     @abstractmethod
-    def display(self) -> None:
-        pass
+    def ask_hover_update(self) -> None:
+        """Ask the UIManager to compute the hovered elements again"""
+
+    @abstractmethod
+    def ask_update(self, element: UIElementInterface) -> None:
+        """Ask the UIManager to call the update method of the element the next time it will be updated"""
+
+    @abstractmethod
+    def ask_layout_update(self, element: UIElementInterface) -> None:
+        """Ask the UIManager to measure the element again in the next layout pass"""
+
+    @abstractmethod
+    def discard_layout_update(self, element: UIElementInterface) -> None:
+        """Remove the element and its children from the elements to lay out in the next layout pass"""
+
+    @abstractmethod
+    def update_layout(self) -> None:
+        """Update the layout of the elements who asked it"""
+
+    @abstractmethod
+    def display(self, clear: bool=True) -> list[Rect]:
+        """
+        If clear is set to True, will fill the window with the background color or image.
+        Returns the rects of the window who were re-displayed.
+        """
+
+    @abstractmethod
+    def get_dirty_rects(self) -> list[Rect]:
+        """Returns the rects of the window who were re-displayed during the last call to display"""
     
     @abstractmethod
-    def get_hovered_element(self) -> list[UIElementInterface]:
-        pass
+    def get_hovered_element(self, pos: tuple[int, int]|None=None) -> list[UIElementInterface]:
+        """Returns all the elements under the given position (or the mouse if not given), in registration order"""
+
+    @abstractmethod
+    def get_deepest_hovered_element(self, pos: tuple[int, int]|None=None) -> UIElementInterface|None:
+        """Returns the deepest element under the given position (or the mouse if not given)"""
 
     @abstractmethod
     def set_focus(self, element: UIElementInterface|None) -> None: